@@ -10,6 +10,7 @@ from .csv_parser import DKBCSVParser
 from .models import Category, ParsedTransaction, ParsingResult, Transaction
 from .output_formatter import ExcelFormatter, SummaryFormatter
 from .parser import DKBParser
+from .transaction_cache import TransactionCache
 
 __version__ = "0.1.0"
 __all__ = [
@@ -22,4 +23,5 @@ __all__ = [
     "ParsingResult",
     "SummaryFormatter",
     "Transaction",
+    "TransactionCache",
 ]
@@ -2,15 +2,188 @@
 Category management system for transaction categorization.
 """
 
+import functools
 import json
 import logging
+import os
 import re
+import shutil
+import sys
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from datetime import date
 from pathlib import Path
+from stat import S_ISREG
+from typing import Any
 
 from .models import Category, ParsedTransaction, Transaction
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of distinct search texts whose categorization is memoized
+CATEGORIZATION_CACHE_SIZE = 4096
+
+# Joins the search texts of a batch for a single search string scan
+_SEARCH_TEXT_SEPARATOR = "\x1f"
+
+
+def _iban_matcher(iban_pattern: str) -> Callable[[str, str], bool]:
+    """
+    Build a case-insensitive matcher for a single IBAN pattern.
+
+    A pattern matches if it equals the IBAN or if it is found in the IBAN as a
+    regular expression. Plain literals and literal prefixes followed by ``\\d+``
+    are matched with string methods instead of the regex engine. The matcher
+    takes the IBAN and its uppercased form, so the IBAN is uppercased once for
+    all patterns.
+
+    Args:
+        iban_pattern: IBAN or regular expression from a category
+
+    Returns:
+        Function returning whether an IBAN matches the pattern
+    """
+    pattern_upper = iban_pattern.upper()
+
+    if iban_pattern.isascii() and re.escape(iban_pattern) == iban_pattern:
+        return lambda iban, iban_upper: pattern_upper in iban_upper
+
+    prefix = iban_pattern.removesuffix(r"\d+")
+    if prefix != iban_pattern and prefix.isascii() and re.escape(prefix) == prefix:
+        prefix_upper = prefix.upper()
+
+        def match_prefix(iban: str, iban_upper: str) -> bool:
+            if iban_upper == pattern_upper:
+                return True
+            start = iban_upper.find(prefix_upper)
+            while start != -1:
+                end = start + len(prefix_upper)
+                if end < len(iban_upper) and iban_upper[end].isdecimal():
+                    return True
+                start = iban_upper.find(prefix_upper, start + 1)
+            return False
+
+        return match_prefix
+
+    try:
+        compiled = re.compile(iban_pattern, re.IGNORECASE)
+    except re.error:
+        return lambda iban, iban_upper: iban_upper == pattern_upper
+    return lambda iban, iban_upper: (
+        iban_upper == pattern_upper
+        or bool(
+            compiled.search(iban),
+        )
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Read and parse a JSON file, reusing the result while the file is unchanged.
+
+    The modification time and size are part of the cache key, so a changed
+    file is read again. Callers must not modify the returned data.
+
+    Args:
+        path: Path of the JSON file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+
+    Returns:
+        Parsed JSON data
+    """
+    return json.loads(Path(path).read_bytes())
+
+
+def _regular_file_stat(path: Path) -> os.stat_result | None:
+    """
+    Stat a path that is expected to be a regular file.
+
+    os.devnull is accepted as an empty configuration that is never loaded.
+
+    Returns:
+        Stat result, or None if the path is missing or os.devnull
+
+    Raises:
+        FileLoadingError: If the path exists but is not a regular file
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if S_ISREG(stat.st_mode):
+        return stat
+    if os.path.samestat(stat, os.stat(os.devnull)):
+        return None
+    raise FileLoadingError(f"Failed to load {path}: not a regular file")
+
+
+@functools.lru_cache(maxsize=1024)
+def _assignment_date(value_date: date) -> str:
+    """Format a value date like the dates of manual assignments (dd.mm.yy)."""
+    return value_date.strftime("%d.%m.%y")
+
+
+def _intern_strings(values: list[str]) -> list[str]:
+    """Intern the strings of a list loaded from JSON, leaving other values as is."""
+    return [sys.intern(value) if isinstance(value, str) else value for value in values]
+
+
+def _combine_regex_patterns(regex_patterns: list[str]) -> list[str] | None:
+    """
+    Prepare regex patterns for use as alternatives of one combined pattern.
+
+    Args:
+        regex_patterns: Regular expressions from categories
+
+    Returns:
+        The valid patterns as non-capturing groups, or None if a pattern would
+        change its meaning inside an alternation
+    """
+    alternatives = []
+    for pattern in regex_patterns:
+        try:
+            compiled = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            # Invalid patterns never match
+            continue
+        if compiled.groups:
+            # Group numbers would shift inside the alternation
+            return None
+        alternatives.append(f"(?:{pattern})")
+    return alternatives
+
+
+def _category_filter(category: Category) -> re.Pattern[str] | None:
+    """
+    Build one pattern that matches wherever any text pattern of a category does.
+
+    The pattern is an alternation of the escaped search strings and the regex
+    patterns of the category. A text it does not match cannot match the
+    category, so it is used to skip categories with a single search.
+
+    Args:
+        category: Category with search strings and/or regex patterns
+
+    Returns:
+        Compiled case-insensitive alternation, or None if the regex patterns
+        cannot be combined without changing their meaning
+    """
+    regex_alternatives = _combine_regex_patterns(category.regex_patterns or [])
+    if regex_alternatives is None:
+        return None
+    alternatives = [
+        re.escape(search_string.lower()) for search_string in category.search_strings
+    ]
+
+    try:
+        return re.compile("|".join(alternatives + regex_alternatives), re.IGNORECASE)
+    except re.error:
+        # e.g. inline global flags that are only valid at the start of a pattern
+        return None
+
 
 class FileLoadingError(Exception):
     """Exception raised when a file cannot be loaded."""
@@ -40,17 +213,60 @@ class CategoryManager:
         self.category_file = category_file
         self.manual_assignments_file = manual_assignments_file
         self.manual_assignments: list[dict[str, str | float]] = []
+        # Memoized categorization results keyed by (search_text, iban)
+        self._categorization_cache: dict[
+            tuple[str, str],
+            tuple[Category | None, tuple[str, ...]],
+        ] = {}
+        # Categories with text patterns in matching order, built on first use
+        self._active_categories: tuple[Category, ...] | None = None
+        # Alternation of all search strings, built on first use
+        self._search_string_filter: re.Pattern[str] | None = None
+        # Alternation of all regex patterns, built on first use
+        self._regex_filter: re.Pattern[str] | None = None
+        # Search strings with their lowercased form per category name, built on
+        # first use
+        self._search_string_pairs: dict[str, tuple[tuple[str, str], ...]] = {}
+        # Combined and individually compiled regex patterns per category name,
+        # built on first use
+        self._regex_matchers: dict[
+            str,
+            tuple[re.Pattern[str] | None, tuple[tuple[str, re.Pattern[str]], ...]],
+        ] = {}
+        # Combined text pattern per category name, built on first use
+        self._category_filters: dict[str, re.Pattern[str] | None] = {}
+        # IBAN pattern matchers per category name, built on first use
+        self._iban_matchers: dict[
+            str,
+            tuple[tuple[str, Callable[[str, str], bool]], ...],
+        ] = {}
+        # Pattern data the caches above were built from; categories and their
+        # pattern lists can also be changed directly, so it is compared before
+        # categorizing. The categories are kept alive so their ids stay unique.
+        self._pattern_snapshot: tuple[tuple[Any, ...], ...] | None = None
+        self._snapshot_categories: tuple[Category, ...] = ()
+        # Manual assignments grouped by (date, recipient, purpose), built on
+        # first use together with the number of assignments it covers
+        self._manual_assignment_index: (
+            dict[tuple[str, str, str], list[dict[str, str | float]]] | None
+        ) = None
+        self._manual_assignment_index_size = 0
+        # Auto-saves are deferred while inside batch()
+        self._deferred = False
+        self._categories_dirty = False
+        self._manual_assignments_dirty = False
 
-        if category_file.exists():
+        category_stat = _regular_file_stat(category_file)
+        if category_stat is not None:
             logger.info(f"Loading categories from {category_file}")
-            self.load_categories()
+            self.load_categories(category_stat)
             logger.info(f"Loaded {len(self.categories)} categories")
         else:
             logger.debug(
                 f"Category config file {category_file} does not exist, will be created on first save",
             )
 
-        if manual_assignments_file.exists():
+        if _regular_file_stat(manual_assignments_file) is not None:
             logger.info(f"Loading manual assignments from {manual_assignments_file}")
             self.load_manual_assignments()
             logger.info(f"Loaded {len(self.manual_assignments)} manual assignments")
@@ -66,32 +282,74 @@ class CategoryManager:
         else:
             logger.info(f"Adding new category '{category.name}'")
         self.categories[category.name] = category
+        self._clear_categorization_cache()
+        self._auto_save_categories(f"adding '{category.name}'")
+
+    def remove_category(self, name: str) -> None:
+        """Remove a category."""
+        if name in self.categories:
+            logger.info(f"Removing category '{name}'")
+            del self.categories[name]
+            self._clear_categorization_cache()
+            self._auto_save_categories(f"removing '{name}'")
+        else:
+            logger.warning(f"Category '{name}' does not exist, cannot remove")
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defer auto-saves until the end of the block.
+
+        Categories and manual assignments changed inside the block are written
+        once on exit instead of after every add/remove call. Nested blocks are
+        flushed by the outermost one. If the block raises, the changes made so
+        far are not saved and the exception propagates unchanged.
 
-        # Auto-save
+        Raises:
+            FileSavingError: If the manual assignments cannot be saved on exit
+        """
+        if self._deferred:
+            yield
+            return
+
+        self._deferred = True
+        try:
+            yield
+        except BaseException:
+            self._categories_dirty = False
+            self._manual_assignments_dirty = False
+            raise
+        finally:
+            self._deferred = False
+
+        if self._categories_dirty:
+            self._auto_save_categories("batch")
+        if self._manual_assignments_dirty:
+            self._auto_save_manual_assignments()
+
+    def _auto_save_categories(self, action: str) -> None:
+        """Save categories after a change, unless saves are deferred."""
+        if self._deferred:
+            self._categories_dirty = True
+            return
+
+        self._categories_dirty = False
         try:
             self.save_categories()
         except FileSavingError as e:
             logger.warning(
-                f"Failed to auto-save categories after adding '{category.name}': {e}. "
+                f"Failed to auto-save categories after {action}: {e}. "
                 f"Please save manually using save_categories().",
             )
 
-    def remove_category(self, name: str) -> None:
-        """Remove a category."""
-        if name in self.categories:
-            logger.info(f"Removing category '{name}'")
-            del self.categories[name]
+    def _auto_save_manual_assignments(self) -> None:
+        """Save manual assignments after a change, unless saves are deferred."""
+        if self._deferred:
+            self._manual_assignments_dirty = True
+            return
 
-            # Auto-save
-            try:
-                self.save_categories()
-            except FileSavingError as e:
-                logger.warning(
-                    f"Failed to auto-save categories after removing '{name}': {e}. "
-                    f"Please save manually using save_categories().",
-                )
-        else:
-            logger.warning(f"Category '{name}' does not exist, cannot remove")
+        self._manual_assignments_dirty = False
+        self.save_manual_assignments()
 
     def get_category(self, name: str) -> Category | None:
         """Get a category by name."""
@@ -117,6 +375,7 @@ class CategoryManager:
             return
 
         self.categories[category_name].search_strings.append(search_string)
+        self._clear_categorization_cache()
         logger.info(
             f"Added search string '{search_string}' to category '{category_name}'",
         )
@@ -138,6 +397,7 @@ class CategoryManager:
             return
 
         self.categories[category_name].search_strings.remove(search_string)
+        self._clear_categorization_cache()
         logger.info(
             f"Removed search string '{search_string}' from category '{category_name}'",
         )
@@ -149,6 +409,27 @@ class CategoryManager:
         """
         Categorize a single transaction.
 
+        Returns:
+            Tuple of (category, list_of_matches)
+        """
+        self._check_pattern_snapshot()
+        return self._categorize(transaction, self._build_search_text(transaction))
+
+    def _categorize(
+        self,
+        transaction: Transaction,
+        search_text: str,
+        has_search_string_hit: bool | None = None,
+    ) -> tuple[Category | None, list[str]]:
+        """
+        Categorize a transaction whose search text is already built.
+
+        Args:
+            transaction: Transaction to categorize
+            search_text: Result of _build_search_text for the transaction
+            has_search_string_hit: Whether any search string occurs in the
+                search text, or None if not known yet
+
         Returns:
             Tuple of (category, list_of_matches)
         """
@@ -157,57 +438,113 @@ class CategoryManager:
         if manual_category:
             return manual_category, ["manual assignment"]
 
-        search_text = f"{transaction.value_date.strftime('%d.%m.%y')} {transaction.recipient} {transaction.purpose}"
+        # Pattern matching only depends on the search text and the IBAN, so
+        # repeated payees can reuse an earlier result
+        cache_key = (search_text, transaction.iban)
+        cached = self._categorization_cache.get(cache_key)
+        if cached is None:
+            category, matches = self._match_categories(
+                search_text,
+                transaction.iban,
+                has_search_string_hit,
+            )
+            if len(self._categorization_cache) >= CATEGORIZATION_CACHE_SIZE:
+                self._categorization_cache.clear()
+            cached = (category, tuple(matches))
+            self._categorization_cache[cache_key] = cached
+
+        return cached[0], list(cached[1])
+
+    @staticmethod
+    def _build_search_text(transaction: Transaction) -> str:
+        """
+        Build the lowercased text that search strings and regexes are matched against.
+
+        The text is built once per transaction and shared by all categories.
+
+        Returns:
+            Value date, recipient, purpose and (if present) IBAN in lowercase
+        """
+        # Same as strftime("%d.%m.%y") without the strftime call
+        value_date = transaction.value_date
+        search_text = (
+            f"{value_date.day:02d}.{value_date.month:02d}.{value_date.year % 100:02d} "
+            f"{transaction.recipient} {transaction.purpose}"
+        )
         # Include IBAN in search text if present
         if transaction.iban and transaction.iban.strip():
             search_text = f"{search_text} {transaction.iban}"
-        search_text = search_text.lower()
+        return search_text.lower()
 
-        for category in self.categories.values():
-            matches = []
-            iban_matches = []
-            text_matches = []
+    def _match_categories(
+        self,
+        search_text: str,
+        iban: str,
+        has_search_string_hit: bool | None = None,
+    ) -> tuple[Category | None, list[str]]:
+        """
+        Match a lowercased search text and IBAN against all categories.
 
-            # Check IBAN patterns (if IBAN is present and category has IBAN patterns)
-            if transaction.iban and transaction.iban.strip() and category.iban_patterns:
-                for iban_pattern in category.iban_patterns:
-                    # IBAN patterns can be exact matches or regex patterns
-                    # Try exact match first (case-insensitive)
-                    if iban_pattern.upper() == transaction.iban.upper():
-                        iban_matches.append(f"iban: {iban_pattern}")
-                    # Try regex match
-                    else:
-                        try:
-                            if re.search(iban_pattern, transaction.iban, re.IGNORECASE):
-                                iban_matches.append(f"iban: {iban_pattern}")
-                        except re.error:
-                            continue
+        Args:
+            search_text: Lowercased search text of the transaction
+            iban: IBAN of the transaction
+            has_search_string_hit: Whether any search string occurs in the
+                search text, or None to check it here
+
+        Returns:
+            Tuple of (category, list_of_matches)
+        """
+        if has_search_string_hit is None:
+            # One scan over the text tells whether any search string can match
+            has_search_string_hit = self._search_string_hits([search_text])[0]
+        has_regex_hit = self._get_regex_filter().search(search_text) is not None
+        if not has_search_string_hit and not has_regex_hit:
+            # Every category needs a text match
+            return None, []
+        # IBAN patterns are ignored for transactions without an IBAN
+        has_iban = bool(iban and iban.strip())
+        iban_upper = iban.upper() if has_iban else ""
+
+        for category in self._get_active_categories():
+            category_filter = self._get_category_filter(category)
+            if category_filter is not None and not category_filter.search(search_text):
+                continue
+
+            text_matches = []
 
             # Check search strings
-            for search_string in category.search_strings:
-                if search_string.lower() in search_text:
-                    text_matches.append(search_string)
+            if has_search_string_hit:
+                for search_string, lowered in self._get_search_string_pairs(category):
+                    if lowered in search_text:
+                        text_matches.append(search_string)
 
             # Check regex patterns
-            if category.regex_patterns:
-                for pattern in category.regex_patterns:
-                    try:
-                        if re.search(pattern, search_text, re.IGNORECASE):
+            if has_regex_hit and category.regex_patterns:
+                combined_regex, compiled_patterns = self._get_regex_matchers(category)
+                if combined_regex is None or combined_regex.search(search_text):
+                    for pattern, compiled in compiled_patterns:
+                        if compiled.search(search_text):
                             text_matches.append(f"regex: {pattern}")
-                    except re.error:
-                        continue
 
-            # If category has IBAN patterns, both IBAN and text matches are required
-            # But if transaction has no IBAN, ignore IBAN patterns (backward compatibility)
-            if category.iban_patterns and transaction.iban and transaction.iban.strip():
-                if iban_matches and text_matches:
-                    matches = iban_matches + text_matches
-                    return category, matches
+            # A text match is always required, so IBAN patterns are only
+            # checked for categories that can still match
+            if not text_matches:
+                continue
+
             # If no IBAN patterns OR transaction has no IBAN, text matches are sufficient
-            else:
-                if text_matches:
-                    matches = text_matches
-                    return category, matches
+            # (backward compatibility for transactions without an IBAN)
+            if not (category.iban_patterns and has_iban):
+                return category, text_matches
+
+            # If category has IBAN patterns, both IBAN and text matches are required
+            # IBAN patterns can be exact matches or regex patterns
+            iban_matches = [
+                f"iban: {iban_pattern}"
+                for iban_pattern, matcher in self._get_iban_matchers(category)
+                if matcher(iban, iban_upper)
+            ]
+            if iban_matches:
+                return category, iban_matches + text_matches
 
         return None, []
 
@@ -221,18 +558,65 @@ class CategoryManager:
         Returns:
             List of ParsedTransaction objects
         """
-        parsed_transactions = []
+        self._check_pattern_snapshot()
+        build_search_text = self._build_search_text
+        search_texts = [build_search_text(transaction) for transaction in transactions]
+        search_string_hits = self._search_string_hits(search_texts)
 
-        for transaction in transactions:
-            category, matches = self.categorize_transaction(transaction)
-            parsed_transaction = ParsedTransaction(
-                transaction=transaction,
-                category=category,
-                search_matches=matches,
+        categorize = self._categorize
+        return [
+            ParsedTransaction(
+                transaction,
+                *categorize(transaction, search_text, has_search_string_hit),
+            )
+            for transaction, search_text, has_search_string_hit in zip(
+                transactions,
+                search_texts,
+                search_string_hits,
+                strict=True,
             )
-            parsed_transactions.append(parsed_transaction)
+        ]
+
+    def _search_string_hits(self, search_texts: list[str]) -> list[bool]:
+        """
+        Find the search texts that contain any search string of any category.
+
+        All texts are joined and scanned with the combined search string
+        filter at once. After a hit the scan continues at the next text.
+
+        Returns:
+            One flag per search text
+        """
+        hits = [False] * len(search_texts)
+        search_string_filter = self._get_search_string_filter()
+        if search_string_filter is None or not search_texts:
+            return hits
+
+        joined = _SEARCH_TEXT_SEPARATOR.join(search_texts)
+        if (
+            _SEARCH_TEXT_SEPARATOR in search_string_filter.pattern
+            or joined.count(_SEARCH_TEXT_SEPARATOR) != len(search_texts) - 1
+        ):
+            # The separator is part of the data, so matches could span texts
+            return [
+                search_string_filter.search(search_text) is not None
+                for search_text in search_texts
+            ]
 
-        return parsed_transactions
+        starts = []
+        position = 0
+        for search_text in search_texts:
+            starts.append(position)
+            position += len(search_text) + len(_SEARCH_TEXT_SEPARATOR)
+
+        position = 0
+        while (match := search_string_filter.search(joined, position)) is not None:
+            index = bisect_right(starts, match.start()) - 1
+            hits[index] = True
+            if index + 1 == len(starts):
+                break
+            position = starts[index + 1]
+        return hits
 
     def save_categories(self) -> None:
         """Save categories to JSON file."""
@@ -252,9 +636,11 @@ class CategoryManager:
             data[name] = category_data
 
         try:
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
             self.category_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.category_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.category_file.write_bytes(payload)
+            # A rewrite can keep the size and modification time of the file
+            _read_json_cached.cache_clear()
             logger.info(f"Successfully saved categories to {self.category_file}")
         except OSError as e:
             logger.error(f"Failed to save categories to {self.category_file}: {e}")
@@ -262,23 +648,39 @@ class CategoryManager:
                 f"Failed to save categories to {self.category_file}: {e}",
             ) from e
 
-    def load_categories(self) -> None:
-        """Load categories from JSON file."""
+    def load_categories(self, stat: os.stat_result | None = None) -> None:
+        """
+        Load categories from JSON file.
+
+        Args:
+            stat: Current stat result of the category file, if already known
+        """
         try:
-            with open(self.category_file, encoding="utf-8") as f:
-                data = json.load(f)
+            if stat is None:
+                stat = self.category_file.stat()
+            data = _read_json_cached(
+                str(self.category_file),
+                stat.st_mtime_ns,
+                stat.st_size,
+            )
 
             self.categories = {}
+            self._clear_categorization_cache()
             for name, category_data in data.items():
+                # Strings repeated across categories share one object
                 category = Category(
-                    name=name,
+                    name=sys.intern(name),
                     display_name=category_data.get("display_name", name),
-                    search_strings=category_data.get("search_strings", []),
-                    regex_patterns=category_data.get("regex_patterns", []),
-                    iban_patterns=category_data.get("iban_patterns", []),
+                    search_strings=_intern_strings(
+                        category_data.get("search_strings") or [],
+                    ),
+                    regex_patterns=list(category_data.get("regex_patterns") or []),
+                    iban_patterns=_intern_strings(
+                        category_data.get("iban_patterns") or [],
+                    ),
                     expected_max_amount=category_data.get("expected_max_amount"),
                 )
-                self.categories[name] = category
+                self.categories[category.name] = category
             logger.debug(
                 f"Loaded {len(self.categories)} categories from {self.category_file}",
             )
@@ -295,10 +697,10 @@ class CategoryManager:
         """Load manual assignments from JSON file."""
 
         try:
-            with open(self.manual_assignments_file, encoding="utf-8") as f:
-                data = json.load(f)
+            data = json.loads(self.manual_assignments_file.read_bytes())
 
             self.manual_assignments = data.get("manual_assignments", [])
+            self._manual_assignment_index = None
 
             # Validate that all categories in manual assignments exist
             for assignment in self.manual_assignments:
@@ -334,14 +736,25 @@ class CategoryManager:
             f"Saving {len(self.manual_assignments)} manual assignments to {self.manual_assignments_file}",
         )
         data = {"manual_assignments": self.manual_assignments}
+        # Write next to the real file so a symlinked assignments file stays
+        # a symlink
+        path = self.manual_assignments_file.resolve()
+        tmp_file = path.with_name(f"{path.name}.tmp")
         try:
-            self.manual_assignments_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.manual_assignments_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temporary file first so a failed save never leaves a
+            # truncated assignments file behind
+            tmp_file.write_bytes(payload)
+            with suppress(FileNotFoundError):
+                shutil.copymode(path, tmp_file)
+            os.replace(tmp_file, path)
             logger.info(
                 f"Successfully saved manual assignments to {self.manual_assignments_file}",
             )
         except OSError as e:
+            with suppress(OSError):
+                tmp_file.unlink(missing_ok=True)
             logger.error(
                 f"Failed to save manual assignments to {self.manual_assignments_file}: {e}",
             )
@@ -376,10 +789,11 @@ class CategoryManager:
             assignment["amount"] = float(amount)
 
         self.manual_assignments.append(assignment)
+        self._manual_assignment_index = None
         logger.info(
             f"Added manual assignment: {date} {recipient[:30]}... -> {category_name}",
         )
-        self.save_manual_assignments()
+        self._auto_save_manual_assignments()
 
     def remove_manual_assignment(self, date: str, recipient: str, purpose: str) -> None:
         """Remove a manual assignment."""
@@ -394,39 +808,273 @@ class CategoryManager:
             )
         ]
 
+        self._manual_assignment_index = None
+
         if len(self.manual_assignments) < initial_count:
             logger.info(f"Removed manual assignment: {date} {recipient[:30]}...")
-            self.save_manual_assignments()
+            self._auto_save_manual_assignments()
         else:
             logger.warning(f"Manual assignment not found: {date} {recipient[:30]}...")
 
+    def _clear_categorization_cache(self) -> None:
+        """Drop memoized categorization results after categories changed."""
+        self._categorization_cache.clear()
+        self._active_categories = None
+        self._search_string_filter = None
+        self._regex_filter = None
+        self._search_string_pairs.clear()
+        self._regex_matchers.clear()
+        self._category_filters.clear()
+        self._iban_matchers.clear()
+
+    def _check_pattern_snapshot(self) -> None:
+        """
+        Drop the categorization caches if categories changed since they were built.
+
+        Covers changes that bypass the add/remove methods, such as appending to
+        a category's pattern lists or replacing the categories dictionary.
+        """
+        categories = tuple(self.categories.values())
+        snapshot = tuple(
+            (
+                name,
+                id(category),
+                tuple(category.search_strings),
+                tuple(category.regex_patterns or ()),
+                tuple(category.iban_patterns or ()),
+            )
+            for name, category in zip(self.categories, categories, strict=True)
+        )
+        if snapshot != self._pattern_snapshot:
+            self._clear_categorization_cache()
+            self._pattern_snapshot = snapshot
+            self._snapshot_categories = categories
+
+    def _get_search_string_pairs(
+        self,
+        category: Category,
+    ) -> tuple[tuple[str, str], ...]:
+        """
+        Get the search strings of a category with their lowercased form.
+
+        Returns:
+            Tuple of (search_string, lowercased_search_string) pairs
+        """
+        pairs = self._search_string_pairs.get(category.name)
+        if pairs is None:
+            pairs = tuple(
+                (search_string, search_string.lower())
+                for search_string in category.search_strings
+            )
+            self._search_string_pairs[category.name] = pairs
+        return pairs
+
+    def _get_regex_matchers(
+        self,
+        category: Category,
+    ) -> tuple[re.Pattern[str] | None, tuple[tuple[str, re.Pattern[str]], ...]]:
+        """
+        Get the compiled regex patterns of a category.
+
+        Invalid patterns are left out, as they never match.
+
+        Returns:
+            Tuple of (combined_pattern, pattern_pairs). The combined pattern
+            matches wherever any regex of the category does, or is None if the
+            regexes cannot be combined. The pairs hold each valid pattern with
+            its compiled form.
+        """
+        matchers = self._regex_matchers.get(category.name)
+        if matchers is None:
+            compiled_patterns = []
+            for pattern in category.regex_patterns or ():
+                try:
+                    compiled_patterns.append(
+                        (pattern, re.compile(pattern, re.IGNORECASE)),
+                    )
+                except re.error:
+                    continue
+
+            alternatives = _combine_regex_patterns(category.regex_patterns or [])
+            combined_regex = None
+            if alternatives:
+                try:
+                    combined_regex = re.compile("|".join(alternatives), re.IGNORECASE)
+                except re.error:
+                    combined_regex = None
+
+            matchers = (combined_regex, tuple(compiled_patterns))
+            self._regex_matchers[category.name] = matchers
+        return matchers
+
+    def _get_category_filter(self, category: Category) -> re.Pattern[str] | None:
+        """
+        Get the combined text pattern of a category.
+
+        Returns:
+            Pattern matching wherever any text pattern of the category does,
+            or None if the category has to be checked pattern by pattern
+        """
+        try:
+            return self._category_filters[category.name]
+        except KeyError:
+            category_filter = _category_filter(category)
+            self._category_filters[category.name] = category_filter
+            return category_filter
+
+    def _get_iban_matchers(
+        self,
+        category: Category,
+    ) -> tuple[tuple[str, Callable[[str, str], bool]], ...]:
+        """
+        Get the IBAN patterns of a category with their matchers.
+
+        Returns:
+            Tuple of (pattern, matcher) pairs
+        """
+        matchers = self._iban_matchers.get(category.name)
+        if matchers is None:
+            matchers = tuple(
+                (iban_pattern, _iban_matcher(iban_pattern))
+                for iban_pattern in category.iban_patterns or ()
+            )
+            self._iban_matchers[category.name] = matchers
+        return matchers
+
+    def _get_active_categories(self) -> tuple[Category, ...]:
+        """
+        Get the categories that can match a transaction.
+
+        A category needs a text match in every case, so categories without
+        search strings and regex patterns are left out.
+
+        Returns:
+            Categories with search strings or regex patterns, in matching order
+        """
+        if self._active_categories is None:
+            self._active_categories = tuple(
+                category
+                for category in self.categories.values()
+                if category.search_strings or category.regex_patterns
+            )
+        return self._active_categories
+
+    def _get_search_string_filter(self) -> re.Pattern[str] | None:
+        """
+        Get a pattern matching any search string of any category.
+
+        Returns:
+            Compiled alternation of all lowercased search strings, or None if
+            no category has search strings
+        """
+        if self._search_string_filter is None:
+            search_strings = {
+                search_string.lower()
+                for category in self.categories.values()
+                for search_string in category.search_strings
+            }
+            if not search_strings:
+                return None
+            self._search_string_filter = re.compile(
+                "|".join(re.escape(search_string) for search_string in search_strings),
+            )
+        return self._search_string_filter
+
+    def _get_regex_filter(self) -> re.Pattern[str]:
+        """
+        Get a pattern matching wherever any regex pattern of any category does.
+
+        Returns:
+            Compiled case-insensitive alternation of all regex patterns. It never
+            matches if there are no valid patterns and always matches if the
+            patterns cannot be combined.
+        """
+        if self._regex_filter is None:
+            alternatives = _combine_regex_patterns(
+                [
+                    pattern
+                    for category in self.categories.values()
+                    for pattern in category.regex_patterns or ()
+                ],
+            )
+            if alternatives is None:
+                # Patterns that cannot be combined are always checked
+                combined = ""
+            elif alternatives:
+                combined = "|".join(alternatives)
+            else:
+                # No valid patterns, so no regex can match
+                combined = "(?!)"
+            try:
+                self._regex_filter = re.compile(combined, re.IGNORECASE)
+            except re.error:
+                # e.g. inline global flags that are only valid at the start
+                self._regex_filter = re.compile("")
+        return self._regex_filter
+
+    def _get_manual_assignment_index(
+        self,
+    ) -> dict[tuple[str, str, str], list[dict[str, str | float]]]:
+        """
+        Get the manual assignments grouped by date, recipient and purpose.
+
+        The index is also rebuilt when the number of assignments changed, which
+        covers assignments appended to the list directly.
+
+        Returns:
+            Dictionary mapping (date, recipient, purpose) to the matching
+            assignments in file order
+        """
+        if (
+            self._manual_assignment_index is None
+            or self._manual_assignment_index_size != len(self.manual_assignments)
+        ):
+            index: dict[tuple[str, str, str], list[dict[str, str | float]]] = {}
+            for assignment in self.manual_assignments:
+                date_str = assignment.get("date")
+                recipient = assignment.get("recipient")
+                purpose = assignment.get("purpose")
+                # Other values never equal the fields of a transaction
+                if (
+                    isinstance(date_str, str)
+                    and isinstance(recipient, str)
+                    and isinstance(purpose, str)
+                ):
+                    index.setdefault((date_str, recipient, purpose), []).append(
+                        assignment,
+                    )
+            self._manual_assignment_index = index
+            self._manual_assignment_index_size = len(self.manual_assignments)
+        return self._manual_assignment_index
+
     def _check_manual_assignment(self, transaction: Transaction) -> Category | None:
         """Check if transaction has a manual assignment."""
-        date_str = transaction.value_date.strftime("%d.%m.%y")
-
-        for assignment in self.manual_assignments:
-            # Match on date, recipient, and purpose
-            if (
-                assignment["date"] == date_str
-                and assignment["recipient"] == transaction.recipient
-                and assignment["purpose"] == transaction.purpose
-            ):
-                # If amount is specified, use it for validation (optional)
-                if "amount" in assignment:
-                    amount_val = assignment["amount"]
-                    if (
-                        isinstance(amount_val, (int, float))
-                        and abs(float(amount_val) - transaction.amount) >= 0.01
-                    ):
-                        continue  # Amount mismatch, skip this assignment
-
-                category_name = assignment["category"]
-                if isinstance(category_name, str):
-                    if category_name not in self.categories:
-                        raise ManualAssignmentCategoryError(
-                            f"Manual assignment references category '{category_name}' which does not exist. "
-                            f"Available categories: {list(self.categories.keys())}",
-                        )
-                    return self.categories[category_name]
+        if not self.manual_assignments:
+            return None
+
+        # Match on date, recipient, and purpose
+        key = (
+            _assignment_date(transaction.value_date),
+            transaction.recipient,
+            transaction.purpose,
+        )
+        for assignment in self._get_manual_assignment_index().get(key, ()):
+            # If amount is specified, use it for validation (optional)
+            if "amount" in assignment:
+                amount_val = assignment["amount"]
+                if (
+                    isinstance(amount_val, (int, float))
+                    and abs(float(amount_val) - transaction.amount) >= 0.01
+                ):
+                    continue  # Amount mismatch, skip this assignment
+
+            category_name = assignment["category"]
+            if isinstance(category_name, str):
+                if category_name not in self.categories:
+                    raise ManualAssignmentCategoryError(
+                        f"Manual assignment references category '{category_name}' which does not exist. "
+                        f"Available categories: {list(self.categories.keys())}",
+                    )
+                return self.categories[category_name]
 
         return None
@@ -6,6 +6,7 @@ import argparse
 import json
 import logging
 import sys
+from collections.abc import Sequence
 from datetime import datetime
 from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
@@ -56,8 +57,14 @@ def save_config(config_file: str, config: dict) -> None:
         ) from e
 
 
-def main():
-    """Main CLI entry point."""
+def main(argv: Sequence[str] | None = None):
+    """
+    Main CLI entry point.
+
+    Args:
+        argv: Command-line arguments without the program name, defaults to
+            sys.argv[1:]
+    """
     parser = argparse.ArgumentParser(
         description="Parse DKB CSV exports and categorize transactions",
     )
@@ -110,7 +117,7 @@ def main():
         help="Show version and exit",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Configure logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -267,8 +274,9 @@ def main():
                 "system_prompt_file, user_prompt_file) are required.",
             )
 
-    # Call OpenRouter only if all three are provided
-    if has_api_key and has_system_prompt and has_user_prompt:
+    # Call OpenRouter only if all three are provided; checking the values
+    # themselves narrows them to str
+    if openrouter_api_key and system_prompt_file_str and user_prompt_file_str:
         if outputs_printed:
             logger.info("\n" + "=" * 50 + "\n")
 
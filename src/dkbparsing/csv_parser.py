@@ -3,7 +3,8 @@ CSV parsing functionality for DKB exports.
 """
 
 import logging
-from datetime import datetime
+from datetime import date
+from typing import TextIO
 
 import pandas as pd
 
@@ -32,14 +33,29 @@ class DKBCSVParser:
         Args:
             file_path: Path to the CSV file
 
+        Returns:
+            List of Transaction objects
+        """
+        try:
+            with open(file_path, encoding=self.encoding, newline="") as f:
+                return self.parse_stream(f)
+        except OSError as e:
+            raise ValueError(f"Error parsing CSV file: {e}") from e
+
+    def parse_stream(self, stream: TextIO) -> list[Transaction]:
+        """
+        Parse DKB CSV content from a text stream.
+
+        Args:
+            stream: Text stream with the content of a DKB CSV export
+
         Returns:
             List of Transaction objects
         """
         try:
             df = pd.read_csv(
-                file_path,
+                stream,
                 delimiter=self.delimiter,
-                encoding=self.encoding,
                 skiprows=self.skiprows,
             )
 
@@ -68,12 +84,15 @@ class DKBCSVParser:
     def filter_by_date_range(
         self,
         transactions: list[Transaction],
-        start_date: datetime,
-        end_date: datetime,
+        start_date: date,
+        end_date: date,
     ) -> list[Transaction]:
         """
         Filter transactions by date range.
 
+        Only the calendar day is compared, so datetime and date values can be
+        mixed.
+
         Args:
             transactions: List of transactions to filter
             start_date: Start date (inclusive)
@@ -82,4 +101,6 @@ class DKBCSVParser:
         Returns:
             Filtered list of transactions
         """
-        return [t for t in transactions if start_date <= t.value_date <= end_date]
+        start = start_date.toordinal()
+        end = end_date.toordinal()
+        return [t for t in transactions if start <= t.value_date.toordinal() <= end]
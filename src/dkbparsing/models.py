@@ -3,7 +3,7 @@ Data models for DKB parsing.
 """
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Any
 
@@ -15,12 +15,12 @@ class TransactionType(Enum):
     EXPENSE = "Ausgang"
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Represents a single bank transaction."""
 
-    booking_date: datetime
-    value_date: datetime
+    booking_date: date
+    value_date: date
     status: str
     payer: str
     recipient: str
@@ -36,8 +36,8 @@ class Transaction:
     def from_csv_row(cls, row: dict[str, Any]) -> "Transaction":
         """Create Transaction from CSV row data."""
         # Parse dates
-        booking_date = datetime.strptime(row["Buchungsdatum"], "%d.%m.%y")
-        value_date = datetime.strptime(row["Wertstellung"], "%d.%m.%y")
+        booking_date = datetime.strptime(row["Buchungsdatum"], "%d.%m.%y").date()
+        value_date = datetime.strptime(row["Wertstellung"], "%d.%m.%y").date()
 
         # Parse amount (handle German number format)
         amount_str = (
@@ -70,7 +70,7 @@ class Transaction:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     """Represents a transaction category."""
 
@@ -88,7 +88,7 @@ class Category:
             object.__setattr__(self, "iban_patterns", [])
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedTransaction:
     """A transaction with its assigned category."""
 
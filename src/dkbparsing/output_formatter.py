@@ -24,6 +24,7 @@ class ExcelFormatter:
         result: ParsingResult,
         show_uncategorized: bool = True,
         show_totals: bool = True,
+        category_order: list[str] | None = None,
     ) -> str:
         """
         Format parsing result for Excel output.
@@ -32,6 +33,8 @@ class ExcelFormatter:
             result: ParsingResult object
             show_uncategorized: Whether to show uncategorized transactions
             show_totals: Whether to show category totals
+            category_order: Category order for this call (defaults to the
+                formatter's category_order)
 
         Returns:
             Formatted string ready for Excel
@@ -41,7 +44,7 @@ class ExcelFormatter:
         # Format categorized transactions
         lines.append("All catagorized transactions:")
         if show_totals:
-            lines.extend(self._format_category_totals(result))
+            lines.extend(self._format_category_totals(result, category_order))
 
         # Format uncategorized transactions
         if show_uncategorized and result.uncategorized_transactions:
@@ -49,12 +52,19 @@ class ExcelFormatter:
 
         return "\n".join(lines)
 
-    def _format_category_totals(self, result: ParsingResult) -> list[str]:
+    def _format_category_totals(
+        self,
+        result: ParsingResult,
+        category_order: list[str] | None = None,
+    ) -> list[str]:
         """Format category totals for Excel."""
         lines = []
 
         # Sort categories by order or alphabetically
-        sorted_categories = self._sort_categories(result.category_totals)
+        sorted_categories = self._sort_categories(
+            result.category_totals,
+            category_order,
+        )
 
         for category_name in sorted_categories:
             amount = result.category_totals[category_name]
@@ -78,13 +88,19 @@ class ExcelFormatter:
 
         return lines
 
-    def _sort_categories(self, category_totals: dict[str, float]) -> list[str]:
+    def _sort_categories(
+        self,
+        category_totals: dict[str, float],
+        category_order: list[str] | None = None,
+    ) -> list[str]:
         """Sort categories by predefined order or alphabetically."""
+        if category_order is None:
+            category_order = self.category_order
         categories = list(category_totals.keys())
 
         # First, add categories in predefined order
         sorted_categories = []
-        for category in self.category_order:
+        for category in category_order:
             if category in categories:
                 sorted_categories.append(category)
 
@@ -105,6 +121,13 @@ class HouseholdFormatter:
     def __init__(self, template_file: str):
         self.template_file = template_file
         self.template_lines = self._load_template()
+        # Template names are resolved once; None marks an empty template line
+        self._template_names: tuple[str | None, ...] = tuple(
+            line.strip() or None for line in self.template_lines
+        )
+        self._template_names_lower = frozenset(
+            name.lower() for name in self._template_names if name
+        )
 
     def _load_template(self) -> list[str]:
         """Load the template file."""
@@ -131,63 +154,47 @@ class HouseholdFormatter:
         Raises:
             TransactionHiddenError: If a category with transactions is not in the template
         """
-        # Create mapping from category display names to amounts (case-insensitive lookup)
-        category_amounts = {}
-        category_lookup = {}  # Lowercase -> original name mapping
-        for category_name, amount in result.category_totals.items():
-            category_amounts[category_name] = amount
-            category_lookup[category_name.lower()] = category_name
-
-        # Get categories with non-zero amounts (transactions)
-        categories_with_transactions = {
-            name for name, amount in category_amounts.items() if amount != 0
-        }
-
-        # Create set of template category names (case-insensitive)
-        template_categories_lower = {
-            line.strip().lower() for line in self.template_lines if line.strip()
-        }
+        category_amounts = result.category_totals
+        # Lowercase -> original name mapping for case-insensitive lookup
+        category_lookup = {name.lower(): name for name in category_amounts}
 
         # Check if all categories with transactions are in the template
-        missing_categories = []
-        for category_name in categories_with_transactions:
-            if category_name.lower() not in template_categories_lower:
-                missing_categories.append(category_name)
+        missing_categories = [
+            name
+            for name, amount in category_amounts.items()
+            if amount != 0 and name.lower() not in self._template_names_lower
+        ]
 
         if missing_categories:
             raise TransactionHiddenError(
                 f"Categories with transactions are not in the output template: {', '.join(missing_categories)}. "
-                f"Template categories: {[line.strip() for line in self.template_lines if line.strip()]}",
+                f"Template categories: {[name for name in self._template_names if name]}",
             )
 
         # Debug: Print available categories and amounts
         logger.debug(f"Available category amounts: {category_amounts}")
         logger.debug(
-            f"Template lines: {[line.strip() for line in self.template_lines]}",
+            f"Template lines: {[name or '' for name in self._template_names]}",
         )
 
         output_lines = []
 
-        for line in self.template_lines:
-            line = line.strip()
-            if not line:  # Empty line
+        for name in self._template_names:
+            if name is None:  # Empty line
                 output_lines.append("")
                 continue
 
-            line_lower = line.lower()
-
-            # Try exact match first
-            if line in category_amounts:
-                amount = category_amounts[line]
-                output_lines.append(self._format_amount(amount))
-            # Try case-insensitive match
-            elif line_lower in category_lookup:
-                original_name = category_lookup[line_lower]
-                amount = category_amounts[original_name]
-                output_lines.append(self._format_amount(amount))
-            else:
-                logger.debug(f"Category '{line}' not found in category_amounts")
+            # Try exact match first, then case-insensitive match
+            original_name = (
+                name if name in category_amounts else category_lookup.get(name.lower())
+            )
+            if original_name is None:
+                logger.debug(f"Category '{name}' not found in category_amounts")
                 output_lines.append("")
+            else:
+                output_lines.append(
+                    self._format_amount(category_amounts[original_name]),
+                )
 
         return "The lines below are for your excel sheet\n" + "\n".join(output_lines)
 
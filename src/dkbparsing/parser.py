@@ -2,13 +2,52 @@
 Main parser class that orchestrates the parsing process.
 """
 
-from datetime import datetime
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import cached_property
 from pathlib import Path
 
 from .category_manager import CategoryManager
 from .csv_parser import DKBCSVParser
-from .models import ParsedTransaction, ParsingResult
+from .models import Category, ParsedTransaction, ParsingResult, Transaction
 from .output_formatter import ExcelFormatter, HouseholdFormatter, SummaryFormatter
+from .transaction_cache import TransactionCache
+
+# Parser instance of a parse_files worker process, created once per process
+_worker_parser: "DKBParser | None" = None
+
+
+def _init_worker(
+    csv_parser: DKBCSVParser,
+    categories: dict[str, Category],
+    manual_assignments: list[dict[str, str | float]],
+    cache_dir: Path | None,
+) -> None:
+    """Create the parser used by a parse_files worker process.
+
+    The worker gets the in-memory state of the parent's parser, so unsaved
+    categories and CSV options are the same as in a single process. The
+    configuration files are not read again.
+    """
+    global _worker_parser
+    _worker_parser = DKBParser(Path(os.devnull), Path(os.devnull), cache_dir)
+    _worker_parser.csv_parser = csv_parser
+    _worker_parser.category_manager.categories = categories
+    _worker_parser.category_manager.manual_assignments = manual_assignments
+
+
+def _parse_in_worker(
+    file_path: str,
+    start_date: date | None,
+    end_date: date | None,
+) -> ParsingResult:
+    """Parse a single file in a parse_files worker process."""
+    if _worker_parser is None:
+        raise RuntimeError("Worker parser has not been initialized")
+    return _worker_parser.parse_file(file_path, start_date, end_date)
 
 
 class DKBParser:
@@ -18,17 +57,32 @@ class DKBParser:
         self,
         category_file: Path,
         manual_assignments_file: Path,
+        cache_dir: Path | None = None,
     ):
         self.csv_parser = DKBCSVParser()
+        # Parsed CSV files are only cached on disk when a cache_dir is given
+        self.transaction_cache = TransactionCache(cache_dir) if cache_dir else None
         self.category_manager = CategoryManager(category_file, manual_assignments_file)
-        self.excel_formatter = ExcelFormatter()
-        self.summary_formatter = SummaryFormatter()
+        # Household formatter of the last template, reused while the template
+        # file is unchanged
+        self._household_formatter: HouseholdFormatter | None = None
+        self._household_template_key: tuple[str, int, int] | None = None
+
+    @cached_property
+    def excel_formatter(self) -> ExcelFormatter:
+        """Excel formatter, created on first use."""
+        return ExcelFormatter()
+
+    @cached_property
+    def summary_formatter(self) -> SummaryFormatter:
+        """Summary formatter, created on first use."""
+        return SummaryFormatter()
 
     def parse_file(
         self,
         file_path: str,
-        start_date: datetime | None = None,
-        end_date: datetime | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
     ) -> ParsingResult:
         """
         Parse a DKB CSV file and categorize transactions.
@@ -42,7 +96,7 @@ class DKBParser:
             ParsingResult object
         """
         # Parse CSV file
-        transactions = self.csv_parser.parse_file(file_path)
+        transactions = self._parse_csv(file_path)
 
         # Apply date filter if provided
         if start_date and end_date:
@@ -76,6 +130,73 @@ class DKBParser:
             total_expenses=total_expenses,
         )
 
+    def parse_files(
+        self,
+        file_paths: list[str],
+        start_date: date | None = None,
+        end_date: date | None = None,
+        max_workers: int | None = None,
+    ) -> list[ParsingResult]:
+        """
+        Parse several DKB CSV files in parallel worker processes.
+
+        Workers get a copy of this parser's categories, manual assignments and
+        CSV options, including changes that have not been saved yet, so the
+        results are the same as with parse_file.
+
+        Args:
+            file_paths: Paths to the CSV files
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            max_workers: Maximum number of worker processes (defaults to CPU count)
+
+        Returns:
+            List of ParsingResult objects in the order of file_paths
+        """
+        workers = min(len(file_paths), max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            return [
+                self.parse_file(file_path, start_date, end_date)
+                for file_path in file_paths
+            ]
+
+        cache_dir = self.transaction_cache.cache_dir if self.transaction_cache else None
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # fork() is unsafe in a process that may already run threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                self.csv_parser,
+                self.category_manager.categories,
+                self.category_manager.manual_assignments,
+                cache_dir,
+            ),
+        ) as executor:
+            return list(
+                executor.map(
+                    _parse_in_worker,
+                    file_paths,
+                    [start_date] * len(file_paths),
+                    [end_date] * len(file_paths),
+                ),
+            )
+
+    def _parse_csv(self, file_path: str) -> list[Transaction]:
+        """Parse a CSV file, using the transaction cache if enabled."""
+        if self.transaction_cache is None:
+            return self.csv_parser.parse_file(file_path)
+
+        parser_options = (
+            f"{self.csv_parser.encoding}:{self.csv_parser.delimiter}:"
+            f"{self.csv_parser.skiprows}"
+        )
+        transactions = self.transaction_cache.load(file_path, parser_options)
+        if transactions is None:
+            transactions = self.csv_parser.parse_file(file_path)
+            self.transaction_cache.store(file_path, transactions, parser_options)
+        return transactions
+
     def add_category(
         self,
         name: str,
@@ -84,8 +205,6 @@ class DKBParser:
         regex_patterns: list[str] | None = None,
     ) -> None:
         """Add a new category."""
-        from .models import Category
-
         category = Category(
             name=name,
             display_name=display_name,
@@ -130,7 +249,10 @@ class DKBParser:
     ) -> str:
         """Format result for Excel output."""
         if category_order:
-            self.excel_formatter.category_order = category_order
+            return self.excel_formatter.format_for_excel(
+                result,
+                category_order=category_order,
+            )
         return self.excel_formatter.format_for_excel(result)
 
     def format_summary(self, result: ParsingResult) -> str:
@@ -172,40 +294,56 @@ class DKBParser:
         Template file should contain category display names directly, one per line.
         Income can be specified with 'einkommen' in the template line name.
         """
-        household_formatter = HouseholdFormatter(template_file)
+        household_formatter = self._get_household_formatter(template_file)
         return household_formatter.format_household_output(result)
 
+    def _get_household_formatter(self, template_file: str) -> HouseholdFormatter:
+        """Get the formatter for a template, reusing it while the file is unchanged."""
+        try:
+            stat = os.stat(template_file)
+        except OSError:
+            # Let HouseholdFormatter report the missing template
+            return HouseholdFormatter(template_file)
+
+        key = (template_file, stat.st_mtime_ns, stat.st_size)
+        if self._household_formatter is None or self._household_template_key != key:
+            self._household_formatter = HouseholdFormatter(template_file)
+            self._household_template_key = key
+        return self._household_formatter
+
     def _calculate_category_totals(
         self,
         parsed_transactions: list[ParsedTransaction],
-    ) -> dict:
+    ) -> dict[str, float]:
         """Calculate totals for each category."""
-        totals = {}
+        amounts_by_category: dict[str, list[float]] = {}
 
         for parsed_transaction in parsed_transactions:
             if parsed_transaction.category:
                 category_name = parsed_transaction.category.display_name
-                amount = parsed_transaction.transaction.amount
-
-                if category_name not in totals:
-                    totals[category_name] = 0.0
-                totals[category_name] += amount
+                amounts_by_category.setdefault(category_name, []).append(
+                    parsed_transaction.transaction.amount,
+                )
 
-        return totals
+        # fsum avoids accumulating rounding errors over many transactions
+        return {
+            category_name: math.fsum(amounts)
+            for category_name, amounts in amounts_by_category.items()
+        }
 
     def _calculate_income_expenses(
         self,
         parsed_transactions: list[ParsedTransaction],
     ) -> tuple[float, float]:
         """Calculate total income and expenses."""
-        total_income = 0.0
-        total_expenses = 0.0
+        income_amounts = []
+        expense_amounts = []
 
         for parsed_transaction in parsed_transactions:
             amount = parsed_transaction.transaction.amount
             if amount >= 0:
-                total_income += amount
+                income_amounts.append(amount)
             else:
-                total_expenses += amount
+                expense_amounts.append(amount)
 
-        return total_income, total_expenses
+        return math.fsum(income_amounts), math.fsum(expense_amounts)
@@ -0,0 +1,156 @@
+"""
+On-disk cache for parsed CSV transactions.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from .models import Transaction, TransactionType
+
+logger = logging.getLogger(__name__)
+
+
+def _default_cache_dir() -> Path:
+    """
+    Get the default cache directory.
+
+    Uses $XDG_CACHE_HOME/dkbparsing, falling back to ~/.cache/dkbparsing if
+    XDG_CACHE_HOME is unset or not an absolute path.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home and os.path.isabs(cache_home):
+        return Path(cache_home) / "dkbparsing"
+    return Path.home() / ".cache" / "dkbparsing"
+
+
+class TransactionCache:
+    """Caches parsed transactions keyed by CSV path, mtime and size.
+
+    Any change to the CSV file changes its key, so stale entries are never
+    returned. Cache files contain bank data and are only readable by the owner.
+    """
+
+    def __init__(self, cache_dir: Path | None = None):
+        # The default is resolved here, so importing the module never needs HOME
+        self.cache_dir = cache_dir if cache_dir is not None else _default_cache_dir()
+
+    def load(
+        self,
+        file_path: str,
+        parser_options: str = "",
+    ) -> list[Transaction] | None:
+        """
+        Load cached transactions for a CSV file.
+
+        Args:
+            file_path: Path to the CSV file
+            parser_options: Parser settings that influence the parse result
+
+        Returns:
+            List of Transaction objects, or None on a cache miss
+        """
+        cache_file = self._cache_file(file_path, parser_options)
+        if cache_file is None:
+            return None
+
+        try:
+            data = json.loads(cache_file.read_bytes())
+            transactions = [self._from_dict(item) for item in data]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable cache file {cache_file}: {e}")
+            return None
+
+        logger.debug(f"Loaded {len(transactions)} transactions from {cache_file}")
+        return transactions
+
+    def store(
+        self,
+        file_path: str,
+        transactions: list[Transaction],
+        parser_options: str = "",
+    ) -> None:
+        """
+        Store parsed transactions for a CSV file.
+
+        Failing to write the cache is logged and otherwise ignored.
+
+        Args:
+            file_path: Path to the CSV file
+            transactions: Parsed transactions of the file
+            parser_options: Parser settings that influence the parse result
+        """
+        cache_file = self._cache_file(file_path, parser_options)
+        if cache_file is None:
+            return
+
+        payload = json.dumps(
+            [self._to_dict(transaction) for transaction in transactions],
+            ensure_ascii=False,
+        ).encode("utf-8")
+        tmp_file = cache_file.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_file, cache_file)
+            logger.debug(f"Cached {len(transactions)} transactions in {cache_file}")
+        except OSError as e:
+            logger.warning(f"Failed to write transaction cache {cache_file}: {e}")
+
+    def _cache_file(self, file_path: str, parser_options: str) -> Path | None:
+        """Get the cache file for the current state of a CSV file."""
+        try:
+            path = Path(file_path).resolve()
+            stat = path.stat()
+        except OSError:
+            return None
+
+        key = hashlib.blake2b(
+            f"{path}:{stat.st_mtime_ns}:{stat.st_size}:{parser_options}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _to_dict(transaction: Transaction) -> dict[str, Any]:
+        """Convert a transaction to JSON-serializable data."""
+        return {
+            "booking_date": transaction.booking_date.isoformat(),
+            "value_date": transaction.value_date.isoformat(),
+            "status": transaction.status,
+            "payer": transaction.payer,
+            "recipient": transaction.recipient,
+            "purpose": transaction.purpose,
+            "transaction_type": transaction.transaction_type.value,
+            "iban": transaction.iban,
+            "amount": transaction.amount,
+            "creditor_id": transaction.creditor_id,
+            "mandate_reference": transaction.mandate_reference,
+            "customer_reference": transaction.customer_reference,
+        }
+
+    @staticmethod
+    def _from_dict(data: dict[str, Any]) -> Transaction:
+        """Create a transaction from cached data."""
+        return Transaction(
+            booking_date=date.fromisoformat(data["booking_date"]),
+            value_date=date.fromisoformat(data["value_date"]),
+            status=data["status"],
+            payer=data["payer"],
+            recipient=data["recipient"],
+            purpose=data["purpose"],
+            transaction_type=TransactionType(data["transaction_type"]),
+            iban=data["iban"],
+            amount=data["amount"],
+            creditor_id=data["creditor_id"],
+            mandate_reference=data["mandate_reference"],
+            customer_reference=data["customer_reference"],
+        )
@@ -0,0 +1,364 @@
+"""Shared pytest fixtures."""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import Any, NamedTuple
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dkbparsing.category_manager import CategoryManager
+from dkbparsing.csv_parser import DKBCSVParser
+from dkbparsing.models import ParsingResult, Transaction, TransactionType
+from dkbparsing.parser import DKBParser
+
+
+def cat(
+    name: str,
+    display: str | None = None,
+    strings: Iterable[str] = (),
+    regex: Iterable[str] = (),
+) -> dict[str, dict[str, Any]]:
+    """Build the JSON data of a single category as stored in categories.json."""
+    return {
+        name: {
+            "display_name": display or name.title(),
+            "search_strings": list(strings),
+            "regex_patterns": list(regex),
+        },
+    }
+
+
+def dump_json(data: Any, path: Path) -> None:
+    """Serialize data as UTF-8 JSON and write it with a single call."""
+    path.write_bytes(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def load_json(path: Path) -> Any:
+    """Read a JSON file from its raw bytes."""
+    return json.loads(path.read_bytes())
+
+
+def write_fixture_files(directory: Path, files: dict[str, bytes]) -> dict[str, Path]:
+    """Write pre-encoded fixture files into a directory.
+
+    Args:
+        directory: Directory to create the files in
+        files: Mapping of file name to file content
+
+    Returns:
+        Mapping of file name to the written path
+    """
+    written = {}
+    for name, content in files.items():
+        path = directory / name
+        path.write_bytes(content)
+        written[name] = path
+    return written
+
+
+# categories.json with only the "test" category, serialized once
+TEST_CATEGORY_JSON = json.dumps(cat("test")).encode("utf-8")
+
+
+def write_test_categories(path: Path) -> None:
+    """Write a categories file that only contains the "test" category."""
+    path.write_bytes(TEST_CATEGORY_JSON)
+
+
+# Categories every baseline CategoryManager starts with
+BASELINE_CATEGORIES = {
+    **cat("groceries", strings=["supermarket"]),
+    **cat("salary", strings=["salary"]),
+}
+
+# Regex pattern of the salary test category
+SALARY_PATTERN = r"SALARY.*\d{4}"
+
+# Transaction to derive test transactions from via dataclasses.replace
+TX_TEMPLATE = Transaction(
+    booking_date=date(2024, 1, 15),
+    value_date=date(2024, 1, 16),
+    status="Buchung",
+    payer="Max Mustermann",
+    recipient="",
+    purpose="",
+    transaction_type=TransactionType.EXPENSE,
+    iban="DE89370400440532013000",
+    amount=-50.25,
+)
+
+
+class Paths(NamedTuple):
+    """Category and manual assignments file paths of a test."""
+
+    category: Path
+    manual: Path
+
+
+class CLITree(NamedTuple):
+    """Files passed to the CLI by tests that mock the parser."""
+
+    category: Path
+    manual: Path
+    config: Path
+    csv: Path
+    template: Path
+
+    def config_data(self, **settings: Any) -> dict[str, Any]:
+        """Build CLI config data pointing at this tree, plus extra settings."""
+        return {
+            "category_config": str(self.category),
+            "manual_assignments_file": str(self.manual),
+            "output_format": "excel",
+            **settings,
+        }
+
+
+class OpenRouterMock(NamedTuple):
+    """Patched OpenAI client class of openrouter_client and its client."""
+
+    openai: Mock
+    client: Mock
+
+    def set_content(self, content: str | None) -> None:
+        """Let chat completions answer with content, or without choices if None."""
+        message = Mock(spec=["content"])
+        message.content = content
+        choice = Mock(spec=["message"])
+        choice.message = message
+        response = Mock(spec=["choices"])
+        response.choices = [] if content is None else [choice]
+        self.client.chat.completions.create.return_value = response
+
+
+@pytest.fixture(autouse=True)
+def _no_persist(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Skip writing categories.json in tests marked with ``no_persist``."""
+    if request.node.get_closest_marker("no_persist"):
+        monkeypatch.setattr(CategoryManager, "save_categories", lambda self: None)
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> Paths:
+    """Category and manual assignments file paths inside a per-test tmp dir."""
+    return Paths(tmp_path / "categories.json", tmp_path / "manual.json")
+
+
+@pytest.fixture
+def fake_dir(fs: Any) -> Path:
+    """Empty directory on pyfakefs' in-memory file system."""
+    fs.create_dir("/fake")
+    return Path("/fake")
+
+
+@pytest.fixture
+def fake_paths(fake_dir: Path) -> Paths:
+    """Category and manual assignments file paths on pyfakefs' in-memory file system."""
+    return Paths(fake_dir / "categories.json", fake_dir / "manual.json")
+
+
+@pytest.fixture
+def empty_manager(paths: Paths) -> CategoryManager:
+    """CategoryManager without categories that saves into the test's tmp dir."""
+    return CategoryManager(paths.category, paths.manual)
+
+
+@pytest.fixture
+def manager_with_test_category(paths: Paths) -> tuple[CategoryManager, Path]:
+    """CategoryManager with a single "test" category and its manual assignments file."""
+    write_test_categories(paths.category)
+    return CategoryManager(paths.category, paths.manual), paths.manual
+
+
+@pytest.fixture(scope="session")
+def baseline_categories_file(
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    """BASELINE_CATEGORIES serialized once and kept in the pytest cache.
+
+    The file name contains a hash of its content, so changing
+    BASELINE_CATEGORIES writes a new file instead of reusing a stale one.
+    Without the cache provider the file lives in a session tmp dir. With
+    pytest-xdist each worker runs this once and the workers share the file.
+    """
+    payload = json.dumps(BASELINE_CATEGORIES).encode("utf-8")
+    file_name = f"categories-{hashlib.sha256(payload).hexdigest()[:16]}.json"
+
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        cached_file = tmp_path_factory.mktemp("dkb-fixtures") / file_name
+        cached_file.write_bytes(payload)
+        return cached_file
+
+    cached_path = cache.get("dkb/categories_v1", None)
+    if (
+        cached_path
+        and Path(cached_path).name == file_name
+        and Path(cached_path).is_file()
+    ):
+        return Path(cached_path)
+
+    # Parallel workers share the pytest cache, so never expose a partial file
+    cached_file = cache.mkdir("dkb-fixtures") / file_name
+    tmp_file = cached_file.with_name(f"{file_name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(payload)
+    os.replace(tmp_file, cached_file)
+    cache.set("dkb/categories_v1", str(cached_file))
+    return cached_file
+
+
+@pytest.fixture
+def categories_file(baseline_categories_file: Path, paths: Paths) -> Path:
+    """Copy of the baseline categories file at the test's category file path."""
+    return Path(shutil.copy(baseline_categories_file, paths.category))
+
+
+@pytest.fixture(scope="session")
+def baseline_manager(
+    baseline_categories_file: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> CategoryManager:
+    """CategoryManager loaded with BASELINE_CATEGORIES, built once per session.
+
+    Only use this directly in tests that do not modify the manager. Tests that
+    mutate it must use the ``manager`` fixture, which hands out a deep copy.
+    """
+    base_dir = tmp_path_factory.mktemp("baseline")
+    category_file = Path(shutil.copy(baseline_categories_file, base_dir))
+    return CategoryManager(category_file, base_dir / "manual.json")
+
+
+@pytest.fixture
+def manager(
+    baseline_manager: CategoryManager,
+    paths: Paths,
+) -> CategoryManager:
+    """Mutable copy of the baseline manager that saves into the test's tmp dir."""
+    manager = copy.deepcopy(baseline_manager)
+    manager.category_file, manager.manual_assignments_file = paths
+    return manager
+
+
+@contextmanager
+def patched_config(config: dict[str, Any]) -> Iterator[None]:
+    """Make the CLI use the given config instead of reading the config file."""
+    with patch("dkbparsing.cli.load_config", return_value=config):
+        yield
+
+
+@pytest.fixture
+def mock_cli_logger(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Replace the CLI logger with a Mock for the duration of a test."""
+    logger = Mock()
+    monkeypatch.setattr("dkbparsing.cli.logger", logger)
+    return logger
+
+
+@pytest.fixture(scope="session")
+def base_cli_tree(tmp_path_factory: pytest.TempPathFactory) -> CLITree:
+    """CLI CSV and template files written once per session.
+
+    The config file is never written, so pass ``config_data`` with
+    patched_config. The category and manual assignments files are not created
+    either, so only use this with a mocked DKBParser and never modify the files.
+    """
+    directory = tmp_path_factory.mktemp("cli")
+    tree = CLITree(
+        category=directory / "categories.json",
+        manual=directory / "manual.json",
+        config=directory / "config.json",
+        csv=directory / "test.csv",
+        template=directory / "template.txt",
+    )
+    tree.csv.write_bytes(b"Header\n")
+    tree.template.write_bytes(b"Groceries\n")
+    return tree
+
+
+@pytest.fixture
+def empty_parse_result() -> ParsingResult:
+    """ParsingResult without any transactions."""
+    return ParsingResult(
+        parsed_transactions=[],
+        uncategorized_transactions=[],
+        category_totals={},
+        total_income=0.0,
+        total_expenses=0.0,
+    )
+
+
+@pytest.fixture(scope="module")
+def csv_parser() -> DKBCSVParser:
+    """DKBCSVParser with default settings, shared by the tests of a module."""
+    return DKBCSVParser()
+
+
+@pytest.fixture(scope="module")
+def tmp_csv_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Temporary directory for CSV files, shared by the tests of a module."""
+    return tmp_path_factory.mktemp("csv")
+
+
+@pytest.fixture(scope="module")
+def make_tx() -> Callable[..., Transaction]:
+    """Factory for transactions based on TX_TEMPLATE.
+
+    The transaction type follows the sign of the amount.
+    """
+
+    def _make(value_date: date, amount: float = -50.25, **changes: Any) -> Transaction:
+        return replace(
+            TX_TEMPLATE,
+            value_date=value_date,
+            amount=amount,
+            transaction_type=(
+                TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+            ),
+            **changes,
+        )
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def minimal_parser(tmp_path_factory: pytest.TempPathFactory) -> DKBParser:
+    """DKBParser with only a groceries category, built once per session.
+
+    Tests must not add categories or manual assignments to this parser.
+    """
+    directory = tmp_path_factory.mktemp("shared")
+    category_file = directory / "categories.json"
+    manual_file = directory / "manual_assignments.json"
+    dump_json(cat("groceries", "Lebensmittel", ["REWE"]), category_file)
+    dump_json({"manual_assignments": []}, manual_file)
+    return DKBParser(category_file, manual_file)
+
+
+@pytest.fixture(scope="session")
+def system_prompt_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """OpenRouter system prompt file written once per session."""
+    path = tmp_path_factory.mktemp("prompts") / "system_prompt.txt"
+    path.write_text("You are a helpful assistant.", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def openrouter_mock(monkeypatch: pytest.MonkeyPatch) -> OpenRouterMock:
+    """Replace the OpenAI client used by call_openrouter with a Mock."""
+    client = Mock()
+    openai = Mock(return_value=client)
+    monkeypatch.setattr("dkbparsing.openrouter_client.OpenAI", openai)
+    return OpenRouterMock(openai, client)
@@ -2,1179 +2,836 @@
 
 import json
 import logging
-import tempfile
+import sys
 from pathlib import Path
-from unittest.mock import Mock, patch
+from typing import Any, Final
+from unittest.mock import Mock
 
 import pytest
 
 from dkbparsing.category_manager import ManualAssignmentCategoryError
 from dkbparsing.cli import FileSavingError, load_config, main, save_config
+from dkbparsing.parser import DKBParser
 
+from .conftest import load_json, patched_config
 
-class TestLoadConfig:
-    """Tests for load_config function."""
-
-    def test_load_config_existing_file(self):
-        """Test loading config from existing file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "config.json"
-            config_data = {
-                "category_config": "categories.json",
-                "manual_assignments_file": "manual.json",
-                "output_format": "excel",
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            result = load_config(str(config_file))
+# Config with the settings every CLI config file has
+_CONFIG_DATA: Final[dict[str, str]] = {
+    "category_config": "categories.json",
+    "manual_assignments_file": "manual.json",
+    "output_format": "excel",
+}
 
-            assert result == config_data
+_BASE_ARGV: Final[tuple[str, ...]] = ("cli.py", "--config")
 
-    def test_load_config_nonexistent_file(self):
-        """Test loading config from non-existent file."""
-        result = load_config("/nonexistent/path/config.json")
 
-        assert result == {}
+def _argv(config: Path, *extra: object) -> list[str]:
+    """Build sys.argv for running the CLI with a config file."""
+    return [*_BASE_ARGV, str(config), *map(str, extra)]
 
-    def test_load_config_invalid_json(self):
-        """Test loading config with invalid JSON."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "config.json"
 
-            with open(config_file, "w", encoding="utf-8") as f:
-                f.write("invalid json {")
+def _cfg(category: Path, manual: Path, **extra: Any) -> dict[str, Any]:
+    """Build CLI config data for the given category and manual files."""
+    return {
+        "category_config": str(category),
+        "manual_assignments_file": str(manual),
+        **extra,
+    }
 
-            result = load_config(str(config_file))
 
-            # Should return empty dict on error
-            assert result == {}
+# Minimal DKB export with a single uncategorized expense
+_CSV_CONTENT: Final[bytes] = (
+    '"Girokonto";"DE87120300001075370831"\n'
+    '"Kontostand vom 01.08.2025:";"9.526,25 €"\n'
+    '""\n'
+    '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)"\n'
+    '"01.08.25";"01.08.25";"Gebucht";"Test";"Unknown";"Test";"Ausgang";"DE123456789";"-10,00"\n'
+).encode()
 
-    def test_load_config_empty_file(self):
-        """Test loading config from empty file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "config.json"
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                f.write("{}")
-
-            result = load_config(str(config_file))
-
-            assert result == {}
 
+class TestLoadConfig:
+    """Tests for load_config function."""
 
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            pytest.param(
+                json.dumps(_CONFIG_DATA).encode("utf-8"),
+                _CONFIG_DATA,
+                id="existing_file",
+            ),
+            pytest.param(None, {}, id="nonexistent_file"),
+            # Invalid JSON results in an empty config
+            pytest.param(b"invalid json {", {}, id="invalid_json"),
+            pytest.param(b"{}", {}, id="empty_file"),
+        ],
+    )
+    def test_load_config(self, fake_dir, content, expected):
+        """Test loading config files, where None means the file does not exist."""
+        config_file = fake_dir / "config.json"
+        if content is not None:
+            config_file.write_bytes(content)
+
+        result = load_config(str(config_file))
+
+        assert result == expected
+
+
+@pytest.mark.usefixtures("fs")
 class TestSaveConfig:
     """Tests for save_config function."""
 
-    def test_save_config_creates_file(self):
+    def test_save_config_creates_file(self, fake_dir):
         """Test that save_config creates the file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "config.json"
-            config_data = {
-                "category_config": "categories.json",
-                "manual_assignments_file": "manual.json",
-            }
+        config_file = fake_dir / "config.json"
+        config_data = {
+            "category_config": "categories.json",
+            "manual_assignments_file": "manual.json",
+        }
 
-            save_config(str(config_file), config_data)
+        save_config(str(config_file), config_data)
 
-            assert config_file.exists()
+        assert config_file.exists()
 
-    def test_save_config_creates_directory(self):
+    def test_save_config_creates_directory(self, fake_dir):
         """Test that save_config creates directory if needed."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "subdir" / "config.json"
-            config_data = {"test": "value"}
+        config_file = fake_dir / "subdir" / "config.json"
+        config_data = {"test": "value"}
 
-            save_config(str(config_file), config_data)
+        save_config(str(config_file), config_data)
 
-            assert config_file.parent.exists()
-            assert config_file.exists()
+        assert config_file.parent.exists()
+        assert config_file.exists()
 
-    def test_save_config_writes_correct_data(self):
+    def test_save_config_writes_correct_data(self, fake_dir):
         """Test that save_config writes correct data."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "config.json"
-            config_data = {
-                "category_config": "categories.json",
-                "manual_assignments_file": "manual.json",
-                "output_format": "excel",
-            }
-
-            save_config(str(config_file), config_data)
+        config_file = fake_dir / "config.json"
+        config_data = {
+            "category_config": "categories.json",
+            "manual_assignments_file": "manual.json",
+            "output_format": "excel",
+        }
 
-            with open(config_file, encoding="utf-8") as f:
-                loaded_data = json.load(f)
+        save_config(str(config_file), config_data)
 
-            assert loaded_data == config_data
+        assert load_json(config_file) == config_data
 
-    def test_save_config_raises_on_error(self):
+    def test_save_config_raises_on_error(self, fake_dir):
         """Test that save_config raises exception on error."""
-        # Try to save to invalid path (if possible)
+        # A regular file where a parent directory is expected fails for any uid
+        blocker = fake_dir / "invalid"
+        blocker.write_bytes(b"")
+
         with pytest.raises(FileSavingError):
-            # This might not work on all systems, but we test the error handling
-            save_config("/root/invalid/path/config.json", {"test": "value"})
+            save_config(str(blocker / "path" / "config.json"), {"test": "value"})
 
 
 class TestCLIMain:
     """Tests for main() function."""
 
-    def test_main_add_category(self):
+    def test_main_add_category(self, tmp_path, monkeypatch, mock_cli_logger):
         """Test adding a category via CLI."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    [
-                        "cli.py",
-                        "--config",
-                        str(config_file),
-                        "--add-category",
-                        "groceries",
-                        "Groceries",
-                        "supermarket",
-                    ],
-                ),
-                patch("dkbparsing.cli.logger") as mock_logger,
-            ):
-                main()
-
-                mock_logger.info.assert_called()
-                # Verify category was added by checking if file exists or was modified
-                # (actual verification would require checking the file content)
-
-    def test_main_add_manual_assignment(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+        )
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            _argv(
+                config_file,
+                "--add-category",
+                "groceries",
+                "Groceries",
+                "supermarket",
+            ),
+        )
+
+        with patched_config(config_data):
+            main()
+
+        mock_cli_logger.info.assert_called()
+        # Verify category was added by checking if file exists or was modified
+        # (actual verification would require checking the file content)
+
+    def test_main_add_manual_assignment(self, tmp_path, monkeypatch, mock_cli_logger):
         """Test adding a manual assignment via CLI."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            # Create category first
-            from dkbparsing.category_manager import CategoryManager
-            from dkbparsing.models import Category
-
-            manager = CategoryManager(category_file, manual_file)
-            manager.add_category(
-                Category(
-                    name="test_category",
-                    display_name="Test Category",
-                    search_strings=[],
-                ),
-            )
-
-            with (
-                patch(
-                    "sys.argv",
-                    [
-                        "cli.py",
-                        "--config",
-                        str(config_file),
-                        "--add-manual",
-                        "16.01.24",
-                        "Test Recipient",
-                        "Test Purpose",
-                        "test_category",
-                    ],
-                ),
-                patch("dkbparsing.cli.logger") as mock_logger,
-            ):
-                main()
-
-                mock_logger.info.assert_called()
-
-    def test_main_add_manual_assignment_with_invalid_category(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+        )
+
+        # Create category first
+        from dkbparsing.category_manager import CategoryManager
+        from dkbparsing.models import Category
+
+        manager = CategoryManager(category_file, manual_file)
+        manager.add_category(
+            Category(
+                name="test_category",
+                display_name="Test Category",
+                search_strings=[],
+            ),
+        )
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            _argv(
+                config_file,
+                "--add-manual",
+                "16.01.24",
+                "Test Recipient",
+                "Test Purpose",
+                "test_category",
+            ),
+        )
+
+        with patched_config(config_data):
+            main()
+
+        mock_cli_logger.info.assert_called()
+
+    def test_main_add_manual_assignment_with_invalid_category(
+        self,
+        tmp_path,
+        monkeypatch,
+    ):
         """Test that adding manual assignment with invalid category raises ManualAssignmentCategoryError."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    [
-                        "cli.py",
-                        "--config",
-                        str(config_file),
-                        "--add-manual",
-                        "16.01.24",
-                        "Test Recipient",
-                        "Test Purpose",
-                        "nonexistent_category",
-                    ],
-                ),
-                pytest.raises(ManualAssignmentCategoryError),
-            ):
-                main()
-
-    def test_main_parse_csv_file(self):
-        """Test parsing a CSV file via CLI."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "test.csv"
-
-            # Create minimal CSV file
-            with open(csv_file, "w", encoding="utf-8") as f:
-                f.write("Header\n")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+        )
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            _argv(
+                config_file,
+                "--add-manual",
+                "16.01.24",
+                "Test Recipient",
+                "Test Purpose",
+                "nonexistent_category",
+            ),
+        )
+
+        with (
+            patched_config(config_data),
+            pytest.raises(ManualAssignmentCategoryError),
+        ):
+            main()
+
+    @pytest.mark.parametrize(
+        ("output_format", "format_methods"),
+        [
+            pytest.param("excel", ["format_for_excel"], id="excel"),
+            pytest.param("summary", ["format_summary"], id="summary"),
+            pytest.param("household", ["format_household"], id="household"),
+            pytest.param(
+                "both",
+                ["format_for_excel", "format_summary", "format_household"],
+                id="both",
+            ),
+        ],
+    )
+    def test_main_output_format(
+        self,
+        base_cli_tree,
+        empty_parse_result,
+        monkeypatch,
+        mock_cli_logger,
+        output_format,
+        format_methods,
+    ):
+        """Test that parsing a CSV file calls the formatters of the output format."""
+        template = str(base_cli_tree.template)
+        config_data = base_cli_tree.config_data(
+            output_format=output_format,
+            output_template=template,
+        )
+        config_file = base_cli_tree.config
+        csv_file = base_cli_tree.csv
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr("dkbparsing.cli.DKBParser", Mock(return_value=mock_parser))
+
+        mock_result = empty_parse_result
+
+        mock_parser.parse_file = Mock(return_value=mock_result)
+
+        with patched_config(config_data):
+            main()
+
+        mock_parser.parse_file.assert_called_once()
+        expected_args = {
+            "format_for_excel": (mock_result,),
+            "format_summary": (mock_result,),
+            "format_household": (mock_result, template),
+        }
+        for method_name, args in expected_args.items():
+            method = getattr(mock_parser, method_name)
+            if method_name in format_methods:
+                method.assert_called_once_with(*args)
+            else:
+                method.assert_not_called()
+        mock_cli_logger.info.assert_called()
+
+    @pytest.mark.usefixtures("mock_cli_logger")
+    def test_main_parse_csv_with_date_filter(
+        self,
+        base_cli_tree,
+        empty_parse_result,
+        monkeypatch,
+    ):
+        """Test parsing CSV with date filters."""
+        config_file = base_cli_tree.config
+        csv_file = base_cli_tree.csv
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            _argv(
+                config_file,
+                csv_file,
+                "--start-date",
+                "01.01.24",
+                "--end-date",
+                "31.01.24",
+            ),
+        )
+        mock_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr("dkbparsing.cli.DKBParser", Mock(return_value=mock_parser))
+
+        mock_result = empty_parse_result
+
+        mock_parser.parse_file = Mock(return_value=mock_result)
+        mock_parser.format_for_excel = Mock(return_value="excel output")
+
+        with patched_config(base_cli_tree.config_data()):
+            main()
+
+        # Verify parse_file was called with date filters
+        call_args = mock_parser.parse_file.call_args
+        assert call_args[0][0] == str(csv_file)
+        assert call_args[0][1] is not None  # start_date
+        assert call_args[0][2] is not None  # end_date
+
+    def test_main_output_format_household_missing_template_exits(
+        self,
+        base_cli_tree,
+        empty_parse_result,
+        monkeypatch,
+        mock_cli_logger,
+    ):
+        """Test that household format exits when template is missing."""
+        # output_template missing
+        config_data = base_cli_tree.config_data(output_format="household")
+        config_file = base_cli_tree.config
+        csv_file = base_cli_tree.csv
 
-                mock_result = Mock()
-                mock_result.parsed_transactions = []
-                mock_result.uncategorized_transactions = []
-                mock_result.category_totals = {}
-                mock_result.total_income = 0.0
-                mock_result.total_expenses = 0.0
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr("dkbparsing.cli.DKBParser", Mock(return_value=mock_parser))
 
-                mock_parser.parse_file = Mock(return_value=mock_result)
-                mock_parser.format_for_excel = Mock(return_value="excel output")
+        mock_result = empty_parse_result
 
-                with patch("dkbparsing.cli.logger") as mock_logger:
-                    main()
+        mock_parser.parse_file = Mock(return_value=mock_result)
 
-                    mock_parser.parse_file.assert_called_once()
-                    mock_parser.format_for_excel.assert_called_once_with(mock_result)
-                    mock_logger.info.assert_called()
+        with patched_config(config_data), pytest.raises(SystemExit) as exc:
+            main()
 
-    def test_main_parse_csv_with_date_filter(self):
-        """Test parsing CSV with date filters."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "test.csv"
-
-            with open(csv_file, "w", encoding="utf-8") as f:
-                f.write("Header\n")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    [
-                        "cli.py",
-                        "--config",
-                        str(config_file),
-                        str(csv_file),
-                        "--start-date",
-                        "01.01.24",
-                        "--end-date",
-                        "31.01.24",
-                    ],
-                ),
-                patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-
-                mock_result = Mock()
-                mock_result.parsed_transactions = []
-                mock_result.uncategorized_transactions = []
-                mock_result.category_totals = {}
-                mock_result.total_income = 0.0
-                mock_result.total_expenses = 0.0
-
-                mock_parser.parse_file = Mock(return_value=mock_result)
-                mock_parser.format_for_excel = Mock(return_value="excel output")
-
-                with patch("dkbparsing.cli.logger"):
-                    main()
-
-                    # Verify parse_file was called with date filters
-                    call_args = mock_parser.parse_file.call_args
-                    assert call_args[0][0] == str(csv_file)
-                    assert call_args[0][1] is not None  # start_date
-                    assert call_args[0][2] is not None  # end_date
-
-    def test_main_output_format_summary(self):
-        """Test output format summary."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "test.csv"
-
-            with open(csv_file, "w", encoding="utf-8") as f:
-                f.write("Header\n")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "summary",
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-
-                mock_result = Mock()
-                mock_result.parsed_transactions = []
-                mock_result.uncategorized_transactions = []
-                mock_result.category_totals = {}
-                mock_result.total_income = 0.0
-                mock_result.total_expenses = 0.0
-
-                mock_parser.parse_file = Mock(return_value=mock_result)
-                mock_parser.format_summary = Mock(return_value="summary output")
-
-                with patch("dkbparsing.cli.logger") as mock_logger:
-                    main()
-
-                    mock_parser.format_summary.assert_called_once_with(mock_result)
-                    mock_logger.info.assert_called()
-
-    def test_main_output_format_household(self):
-        """Test output format household."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "test.csv"
-            template_file = Path(tmpdir) / "template.txt"
-
-            with open(csv_file, "w", encoding="utf-8") as f:
-                f.write("Header\n")
-
-            with open(template_file, "w", encoding="utf-8") as f:
-                f.write("Groceries\n")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "household",
-                "output_template": str(template_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-
-                mock_result = Mock()
-                mock_result.parsed_transactions = []
-                mock_result.uncategorized_transactions = []
-                mock_result.category_totals = {}
-                mock_result.total_income = 0.0
-                mock_result.total_expenses = 0.0
-
-                mock_parser.parse_file = Mock(return_value=mock_result)
-                mock_parser.format_household = Mock(return_value="household output")
-
-                with patch("dkbparsing.cli.logger") as mock_logger:
-                    main()
-
-                    mock_parser.format_household.assert_called_once_with(
-                        mock_result,
-                        str(template_file),
-                    )
-                    mock_logger.info.assert_called()
-
-    def test_main_output_format_household_missing_template_exits(self):
-        """Test that household format exits when template is missing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "test.csv"
-
-            with open(csv_file, "w", encoding="utf-8") as f:
-                f.write("Header\n")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "household",
-                # output_template missing
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-
-                mock_result = Mock()
-                mock_result.parsed_transactions = []
-                mock_result.uncategorized_transactions = []
-                mock_result.category_totals = {}
-                mock_result.total_income = 0.0
-                mock_result.total_expenses = 0.0
-
-                mock_parser.parse_file = Mock(return_value=mock_result)
-
-                with (
-                    patch("sys.exit") as mock_exit,
-                    patch(
-                        "dkbparsing.cli.logger",
-                    ) as mock_logger,
-                ):
-                    main()
-
-                    mock_exit.assert_called_once_with(1)
-                    mock_logger.error.assert_called()
-
-    def test_main_output_format_both(self):
-        """Test output format both (excel and summary)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "test.csv"
-
-            with open(csv_file, "w", encoding="utf-8") as f:
-                f.write("Header\n")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "both",
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-
-                mock_result = Mock()
-                mock_result.parsed_transactions = []
-                mock_result.uncategorized_transactions = []
-                mock_result.category_totals = {}
-                mock_result.total_income = 0.0
-                mock_result.total_expenses = 0.0
-
-                mock_parser.parse_file = Mock(return_value=mock_result)
-                mock_parser.format_for_excel = Mock(return_value="excel output")
-                mock_parser.format_summary = Mock(return_value="summary output")
-
-                with (
-                    patch("dkbparsing.cli.logger") as mock_logger,
-                    patch(
-                        "sys.exit",
-                    ),
-                ):
-                    main()
-
-                    mock_parser.format_for_excel.assert_called_once()
-                    mock_parser.format_summary.assert_called_once()
-                    # Should log both outputs with separator
-                    assert mock_logger.info.call_count >= 2
-
-    def test_main_verbose_logging(self):
+        assert exc.value.code == 1
+        mock_cli_logger.error.assert_called()
+
+    def test_main_verbose_logging(self, tmp_path, monkeypatch):
         """Test that --verbose enables verbose logging."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), "--verbose"],
-                ),
-                patch("dkbparsing.cli.logging.basicConfig") as mock_basic_config,
-                patch(
-                    "dkbparsing.cli.argparse.ArgumentParser",
-                ) as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.verbose = True
-                mock_args.csv_file = None
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-                with (
-                    patch("dkbparsing.cli.DKBParser"),
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("sys.exit"),
-                ):
-                    main()
-
-                    # Verify logging was configured with DEBUG level
-                    call_kwargs = mock_basic_config.call_args[1]
-                    assert call_kwargs["level"] == logging.DEBUG
-
-    def test_main_no_csv_file_no_operations(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, "--verbose"))
+        mock_basic_config = Mock()
+        monkeypatch.setattr("dkbparsing.cli.logging.basicConfig", mock_basic_config)
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+        monkeypatch.setattr("dkbparsing.cli.DKBParser", Mock())
+        monkeypatch.setattr(sys, "exit", Mock())
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.verbose = True
+        mock_args.csv_file = None
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+
+        with patched_config(config_data):
+            main()
+
+        # Verify logging was configured with DEBUG level
+        call_kwargs = mock_basic_config.call_args[1]
+        assert call_kwargs["level"] == logging.DEBUG
+
+    @pytest.mark.usefixtures("mock_cli_logger")
+    def test_main_no_csv_file_no_operations(self, tmp_path, monkeypatch):
         """Test that main shows error when no CSV file and no operations."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file)],
-                ),
-                patch("dkbparsing.cli.argparse.ArgumentParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.csv_file = None
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.add_search_string = None
-                mock_args.remove_search_string = None
-                mock_args.verbose = False
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-                mock_parser.error = Mock(side_effect=SystemExit)
-
-                with (
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("dkbparsing.cli.logger"),
-                ):
-                    # This should call parser.error()
-                    with pytest.raises(SystemExit):
-                        main()
-
-                    # Verify error was called
-                    mock_parser.error.assert_called()
-
-    def test_main_calls_openrouter_when_configured(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file))
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.csv_file = None
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.add_search_string = None
+        mock_args.remove_search_string = None
+        mock_args.verbose = False
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+        mock_parser.error = Mock(side_effect=SystemExit)
+
+        # This should call parser.error()
+        with patched_config(config_data), pytest.raises(SystemExit):
+            main()
+
+        # Verify error was called
+        mock_parser.error.assert_called()
+
+    @pytest.mark.usefixtures("mock_cli_logger")
+    def test_main_calls_openrouter_when_configured(
+        self,
+        tmp_path,
+        system_prompt_file,
+        monkeypatch,
+    ):
         """Test that OpenRouter is called when both API key and system prompt file are set."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "transactions.csv"
-            system_prompt_file = Path(tmpdir) / "system_prompt.txt"
-
-            # Create minimal category file
-            with open(category_file, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-
-            # Create minimal manual assignments file
-            with open(manual_file, "w", encoding="utf-8") as f:
-                json.dump({"manual_assignments": []}, f)
-
-            # Create system prompt file
-            system_prompt_file.write_text(
-                "You are a helpful assistant.",
-                encoding="utf-8",
-            )
-
-            # Create minimal CSV file
-            csv_content = (
-                '"Girokonto";"DE87120300001075370831"\n'
-                '"Kontostand vom 01.08.2025:";"9.526,25 €"\n'
-                '""\n'
-                '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)"\n'
-                '"01.08.25";"01.08.25";"Gebucht";"Test";"Unknown";"Test";"Ausgang";"DE123456789";"-10,00"\n'
-            )
-            csv_file.write_text(csv_content, encoding="utf-8")
-
-            user_prompt_file = Path(tmpdir) / "user_prompt.txt"
-            user_prompt_file.write_text("Test prompt", encoding="utf-8")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-                "openrouter_api_key": "test-api-key",
-                "system_prompt_file": str(system_prompt_file),
-                "user_prompt_file": str(user_prompt_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+        csv_file = tmp_path / "transactions.csv"
+
+        csv_file.write_bytes(_CSV_CONTENT)
+
+        user_prompt_file = tmp_path / "user_prompt.txt"
+        user_prompt_file.write_bytes(b"Test prompt")
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+            output_format="excel",
+            openrouter_api_key="test-api-key",
+            system_prompt_file=str(system_prompt_file),
+            user_prompt_file=str(user_prompt_file),
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+        mock_dkb_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr(
+            "dkbparsing.cli.DKBParser",
+            Mock(return_value=mock_dkb_parser),
+        )
+        mock_openrouter = Mock()
+        monkeypatch.setattr("dkbparsing.cli.call_openrouter", mock_openrouter)
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.csv_file = str(csv_file)
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.add_search_string = None
+        mock_args.remove_search_string = None
+        mock_args.verbose = False
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+
+        # Mock parsing result
+        from datetime import date
+
+        from dkbparsing.models import (
+            ParsingResult,
+            Transaction,
+            TransactionType,
+        )
+
+        mock_result = ParsingResult(
+            parsed_transactions=[],
+            uncategorized_transactions=[
+                Transaction(
+                    booking_date=date(2025, 8, 1),
+                    value_date=date(2025, 8, 1),
+                    status="Gebucht",
+                    payer="Test",
+                    recipient="Unknown",
+                    purpose="Test",
+                    transaction_type=TransactionType.EXPENSE,
+                    iban="DE123456789",
+                    amount=-10.0,
                 ),
-                patch("dkbparsing.cli.argparse.ArgumentParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.csv_file = str(csv_file)
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.add_search_string = None
-                mock_args.remove_search_string = None
-                mock_args.verbose = False
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-
-                with (
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-                    patch("dkbparsing.cli.call_openrouter") as mock_openrouter,
-                    patch("dkbparsing.cli.logger"),
-                ):
-                    mock_dkb_parser = Mock()
-                    mock_parser_class.return_value = mock_dkb_parser
-
-                    # Mock parsing result
-                    from datetime import datetime
-
-                    from dkbparsing.models import (
-                        ParsingResult,
-                        Transaction,
-                        TransactionType,
-                    )
-
-                    mock_result = ParsingResult(
-                        parsed_transactions=[],
-                        uncategorized_transactions=[
-                            Transaction(
-                                booking_date=datetime(2025, 8, 1),
-                                value_date=datetime(2025, 8, 1),
-                                status="Gebucht",
-                                payer="Test",
-                                recipient="Unknown",
-                                purpose="Test",
-                                transaction_type=TransactionType.EXPENSE,
-                                iban="DE123456789",
-                                amount=-10.0,
-                            ),
-                        ],
-                        category_totals={},
-                        total_income=0.0,
-                        total_expenses=-10.0,
-                    )
-
-                    mock_dkb_parser.parse_file.return_value = mock_result
-                    mock_dkb_parser.format_for_excel.return_value = "Excel output"
-                    mock_dkb_parser.category_manager.manual_assignments = []
-                    mock_openrouter.return_value = "AI suggestions"
-
-                    main()
-
-                    # Verify OpenRouter was called
-                    mock_openrouter.assert_called_once()
-                    call_args = mock_openrouter.call_args
-                    assert call_args[1]["api_key"] == "test-api-key"
-                    assert call_args[1]["system_prompt_file"] == system_prompt_file
-                    assert call_args[1]["manual_assignments"] == []
-                    assert len(call_args[1]["uncategorized_transactions"]) == 1
-                    # Verify user_prompt_file was passed (should be a Path object)
-                    assert call_args[1]["user_prompt_file"] is not None
-                    assert isinstance(call_args[1]["user_prompt_file"], Path)
-
-    def test_main_skips_openrouter_when_not_configured(self):
+            ],
+            category_totals={},
+            total_income=0.0,
+            total_expenses=-10.0,
+        )
+
+        mock_dkb_parser.parse_file.return_value = mock_result
+        mock_dkb_parser.format_for_excel.return_value = "Excel output"
+        mock_dkb_parser.category_manager = Mock(manual_assignments=[])
+        mock_openrouter.return_value = "AI suggestions"
+
+        with patched_config(config_data):
+            main()
+
+        # Verify OpenRouter was called
+        mock_openrouter.assert_called_once()
+        call_args = mock_openrouter.call_args
+        assert call_args[1]["api_key"] == "test-api-key"
+        assert call_args[1]["system_prompt_file"] == system_prompt_file
+        assert call_args[1]["manual_assignments"] == []
+        assert len(call_args[1]["uncategorized_transactions"]) == 1
+        # Verify user_prompt_file was passed (should be a Path object)
+        assert call_args[1]["user_prompt_file"] is not None
+        assert isinstance(call_args[1]["user_prompt_file"], Path)
+
+    @pytest.mark.usefixtures("mock_cli_logger")
+    def test_main_skips_openrouter_when_not_configured(
+        self,
+        tmp_path,
+        empty_parse_result,
+        monkeypatch,
+    ):
         """Test that OpenRouter is not called when API key or system prompt file is missing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "transactions.csv"
-
-            # Create minimal files
-            with open(category_file, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-            with open(manual_file, "w", encoding="utf-8") as f:
-                json.dump({"manual_assignments": []}, f)
-
-            csv_content = (
-                '"Girokonto";"DE87120300001075370831"\n'
-                '"Kontostand vom 01.08.2025:";"9.526,25 €"\n'
-                '""\n'
-                '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)"\n'
-                '"01.08.25";"01.08.25";"Gebucht";"Test";"Unknown";"Test";"Ausgang";"DE123456789";"-10,00"\n'
-            )
-            csv_file.write_text(csv_content, encoding="utf-8")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-                # No openrouter_api_key or system_prompt_file
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.argparse.ArgumentParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.csv_file = str(csv_file)
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.add_search_string = None
-                mock_args.remove_search_string = None
-                mock_args.verbose = False
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-
-                with (
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-                    patch("dkbparsing.cli.call_openrouter") as mock_openrouter,
-                    patch("dkbparsing.cli.logger"),
-                ):
-                    mock_dkb_parser = Mock()
-                    mock_parser_class.return_value = mock_dkb_parser
-
-                    from dkbparsing.models import ParsingResult
-
-                    mock_result = ParsingResult(
-                        parsed_transactions=[],
-                        uncategorized_transactions=[],
-                        category_totals={},
-                        total_income=0.0,
-                        total_expenses=0.0,
-                    )
-
-                    mock_dkb_parser.parse_file.return_value = mock_result
-                    mock_dkb_parser.format_for_excel.return_value = "Excel output"
-
-                    main()
-
-                    # Verify OpenRouter was NOT called
-                    mock_openrouter.assert_not_called()
-
-    def test_main_warns_on_partial_openrouter_config(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+        csv_file = tmp_path / "transactions.csv"
+
+        csv_file.write_bytes(_CSV_CONTENT)
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+            output_format="excel",
+            # No openrouter_api_key or system_prompt_file
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+        mock_dkb_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr(
+            "dkbparsing.cli.DKBParser",
+            Mock(return_value=mock_dkb_parser),
+        )
+        mock_openrouter = Mock()
+        monkeypatch.setattr("dkbparsing.cli.call_openrouter", mock_openrouter)
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.csv_file = str(csv_file)
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.add_search_string = None
+        mock_args.remove_search_string = None
+        mock_args.verbose = False
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+
+        mock_result = empty_parse_result
+
+        mock_dkb_parser.parse_file.return_value = mock_result
+        mock_dkb_parser.format_for_excel.return_value = "Excel output"
+
+        with patched_config(config_data):
+            main()
+
+        # Verify OpenRouter was NOT called
+        mock_openrouter.assert_not_called()
+
+    def test_main_warns_on_partial_openrouter_config(
+        self,
+        tmp_path,
+        empty_parse_result,
+        monkeypatch,
+        mock_cli_logger,
+    ):
         """Test that warning is shown when OpenRouter is partially configured."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "transactions.csv"
-
-            # Create minimal files
-            with open(category_file, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-            with open(manual_file, "w", encoding="utf-8") as f:
-                json.dump({"manual_assignments": []}, f)
-
-            csv_content = (
-                '"Girokonto";"DE87120300001075370831"\n'
-                '"Kontostand vom 01.08.2025:";"9.526,25 €"\n'
-                '""\n'
-                '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)"\n'
-                '"01.08.25";"01.08.25";"Gebucht";"Test";"Unknown";"Test";"Ausgang";"DE123456789";"-10,00"\n'
-            )
-            csv_file.write_text(csv_content, encoding="utf-8")
-
-            # Test with only API key
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-                "openrouter_api_key": "test-api-key",
-                # Missing system_prompt_file and user_prompt_file
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.argparse.ArgumentParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.csv_file = str(csv_file)
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.add_search_string = None
-                mock_args.remove_search_string = None
-                mock_args.verbose = False
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-
-                with (
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-                    patch("dkbparsing.cli.call_openrouter") as mock_openrouter,
-                    patch("dkbparsing.cli.logger") as mock_logger,
-                ):
-                    mock_dkb_parser = Mock()
-                    mock_parser_class.return_value = mock_dkb_parser
-
-                    from dkbparsing.models import ParsingResult
-
-                    mock_result = ParsingResult(
-                        parsed_transactions=[],
-                        uncategorized_transactions=[],
-                        category_totals={},
-                        total_income=0.0,
-                        total_expenses=0.0,
-                    )
-
-                    mock_dkb_parser.parse_file.return_value = mock_result
-                    mock_dkb_parser.format_for_excel.return_value = "Excel output"
-
-                    main()
-
-                    # Verify warning was logged
-                    warning_calls = [
-                        call
-                        for call in mock_logger.warning.call_args_list
-                        if "OpenRouter configuration incomplete" in str(call)
-                    ]
-                    assert len(warning_calls) > 0
-
-                    # Verify OpenRouter was NOT called
-                    mock_openrouter.assert_not_called()
-
-    def test_main_no_warning_when_no_openrouter_config(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+        csv_file = tmp_path / "transactions.csv"
+
+        csv_file.write_bytes(_CSV_CONTENT)
+
+        # Test with only API key
+        config_data = _cfg(
+            category_file,
+            manual_file,
+            output_format="excel",
+            openrouter_api_key="test-api-key",
+            # Missing system_prompt_file and user_prompt_file
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+        mock_dkb_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr(
+            "dkbparsing.cli.DKBParser",
+            Mock(return_value=mock_dkb_parser),
+        )
+        mock_openrouter = Mock()
+        monkeypatch.setattr("dkbparsing.cli.call_openrouter", mock_openrouter)
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.csv_file = str(csv_file)
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.add_search_string = None
+        mock_args.remove_search_string = None
+        mock_args.verbose = False
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+
+        mock_result = empty_parse_result
+
+        mock_dkb_parser.parse_file.return_value = mock_result
+        mock_dkb_parser.format_for_excel.return_value = "Excel output"
+
+        with patched_config(config_data):
+            main()
+
+        # Verify warning was logged
+        warning_calls = [
+            call
+            for call in mock_cli_logger.warning.call_args_list
+            if "OpenRouter configuration incomplete" in str(call)
+        ]
+        assert len(warning_calls) > 0
+
+        # Verify OpenRouter was NOT called
+        mock_openrouter.assert_not_called()
+
+    def test_main_no_warning_when_no_openrouter_config(
+        self,
+        tmp_path,
+        empty_parse_result,
+        monkeypatch,
+        mock_cli_logger,
+    ):
         """Test that no warning is shown when no OpenRouter config is provided."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "transactions.csv"
-
-            # Create minimal files
-            with open(category_file, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-            with open(manual_file, "w", encoding="utf-8") as f:
-                json.dump({"manual_assignments": []}, f)
-
-            csv_content = (
-                '"Girokonto";"DE87120300001075370831"\n'
-                '"Kontostand vom 01.08.2025:";"9.526,25 €"\n'
-                '""\n'
-                '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)"\n'
-                '"01.08.25";"01.08.25";"Gebucht";"Test";"Unknown";"Test";"Ausgang";"DE123456789";"-10,00"\n'
-            )
-            csv_file.write_text(csv_content, encoding="utf-8")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-                # No OpenRouter config at all
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
-                ),
-                patch("dkbparsing.cli.argparse.ArgumentParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.csv_file = str(csv_file)
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.add_search_string = None
-                mock_args.remove_search_string = None
-                mock_args.verbose = False
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-
-                with (
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-                    patch("dkbparsing.cli.call_openrouter") as mock_openrouter,
-                    patch("dkbparsing.cli.logger") as mock_logger,
-                ):
-                    mock_dkb_parser = Mock()
-                    mock_parser_class.return_value = mock_dkb_parser
-
-                    from dkbparsing.models import ParsingResult
-
-                    mock_result = ParsingResult(
-                        parsed_transactions=[],
-                        uncategorized_transactions=[],
-                        category_totals={},
-                        total_income=0.0,
-                        total_expenses=0.0,
-                    )
-
-                    mock_dkb_parser.parse_file.return_value = mock_result
-                    mock_dkb_parser.format_for_excel.return_value = "Excel output"
-
-                    main()
-
-                    # Verify no warning about OpenRouter was logged
-                    warning_calls = [
-                        call
-                        for call in mock_logger.warning.call_args_list
-                        if "OpenRouter" in str(call)
-                    ]
-                    assert len(warning_calls) == 0
-
-                    # Verify OpenRouter was NOT called
-                    mock_openrouter.assert_not_called()
-
-    def test_main_calls_openrouter_with_user_prompt_file(self):
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+        csv_file = tmp_path / "transactions.csv"
+
+        csv_file.write_bytes(_CSV_CONTENT)
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+            output_format="excel",
+            # No OpenRouter config at all
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+        mock_dkb_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr(
+            "dkbparsing.cli.DKBParser",
+            Mock(return_value=mock_dkb_parser),
+        )
+        mock_openrouter = Mock()
+        monkeypatch.setattr("dkbparsing.cli.call_openrouter", mock_openrouter)
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.csv_file = str(csv_file)
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.add_search_string = None
+        mock_args.remove_search_string = None
+        mock_args.verbose = False
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+
+        mock_result = empty_parse_result
+
+        mock_dkb_parser.parse_file.return_value = mock_result
+        mock_dkb_parser.format_for_excel.return_value = "Excel output"
+
+        with patched_config(config_data):
+            main()
+
+        # Verify no warning about OpenRouter was logged
+        warning_calls = [
+            call
+            for call in mock_cli_logger.warning.call_args_list
+            if "OpenRouter" in str(call)
+        ]
+        assert len(warning_calls) == 0
+
+        # Verify OpenRouter was NOT called
+        mock_openrouter.assert_not_called()
+
+    @pytest.mark.usefixtures("mock_cli_logger")
+    def test_main_calls_openrouter_with_user_prompt_file(
+        self,
+        tmp_path,
+        system_prompt_file,
+        monkeypatch,
+    ):
         """Test that OpenRouter is called with user prompt file when configured."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            category_file = Path(tmpdir) / "categories.json"
-            manual_file = Path(tmpdir) / "manual.json"
-            config_file = Path(tmpdir) / "config.json"
-            csv_file = Path(tmpdir) / "transactions.csv"
-            system_prompt_file = Path(tmpdir) / "system_prompt.txt"
-            user_prompt_file = Path(tmpdir) / "user_prompt.txt"
-
-            # Create minimal category file
-            with open(category_file, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-
-            # Create minimal manual assignments file
-            with open(manual_file, "w", encoding="utf-8") as f:
-                json.dump({"manual_assignments": []}, f)
-
-            # Create system prompt file
-            system_prompt_file.write_text(
-                "You are a helpful assistant.",
-                encoding="utf-8",
-            )
-
-            # Create user prompt file
-            user_prompt_file = Path(tmpdir) / "user_prompt.txt"
-            user_prompt_file.write_text(
-                "Custom prompt: {manual_assignments} {uncategorized_transactions}",
-                encoding="utf-8",
-            )
-
-            # Create minimal CSV file
-            csv_content = (
-                '"Girokonto";"DE87120300001075370831"\n'
-                '"Kontostand vom 01.08.2025:";"9.526,25 €"\n'
-                '""\n'
-                '"Buchungsdatum";"Wertstellung";"Status";"Zahlungspflichtige*r";"Zahlungsempfänger*in";"Verwendungszweck";"Umsatztyp";"IBAN";"Betrag (€)"\n'
-                '"01.08.25";"01.08.25";"Gebucht";"Test";"Unknown";"Test";"Ausgang";"DE123456789";"-10,00"\n'
-            )
-            csv_file.write_text(csv_content, encoding="utf-8")
-
-            config_data = {
-                "category_config": str(category_file),
-                "manual_assignments_file": str(manual_file),
-                "output_format": "excel",
-                "openrouter_api_key": "test-api-key",
-                "system_prompt_file": str(system_prompt_file),
-                "user_prompt_file": str(user_prompt_file),
-            }
-
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config_data, f)
-
-            with (
-                patch(
-                    "sys.argv",
-                    ["cli.py", "--config", str(config_file), str(csv_file)],
+        category_file = tmp_path / "categories.json"
+        manual_file = tmp_path / "manual.json"
+        config_file = tmp_path / "config.json"
+        csv_file = tmp_path / "transactions.csv"
+
+        # Create user prompt file
+        user_prompt_file = tmp_path / "user_prompt.txt"
+        user_prompt_file.write_bytes(
+            b"Custom prompt: {manual_assignments} {uncategorized_transactions}",
+        )
+
+        csv_file.write_bytes(_CSV_CONTENT)
+
+        config_data = _cfg(
+            category_file,
+            manual_file,
+            output_format="excel",
+            openrouter_api_key="test-api-key",
+            system_prompt_file=str(system_prompt_file),
+            user_prompt_file=str(user_prompt_file),
+        )
+
+        monkeypatch.setattr(sys, "argv", _argv(config_file, csv_file))
+        mock_parser = Mock()
+        monkeypatch.setattr(
+            "dkbparsing.cli.argparse.ArgumentParser",
+            Mock(return_value=mock_parser),
+        )
+        mock_dkb_parser = Mock(spec=DKBParser)
+        monkeypatch.setattr(
+            "dkbparsing.cli.DKBParser",
+            Mock(return_value=mock_dkb_parser),
+        )
+        mock_openrouter = Mock()
+        monkeypatch.setattr("dkbparsing.cli.call_openrouter", mock_openrouter)
+
+        mock_args = Mock()
+        mock_args.config = str(config_file)
+        mock_args.csv_file = str(csv_file)
+        mock_args.add_category = None
+        mock_args.add_manual = None
+        mock_args.add_search_string = None
+        mock_args.remove_search_string = None
+        mock_args.verbose = False
+        mock_args.start_date = None
+        mock_args.end_date = None
+        mock_args.version = False
+        mock_parser.parse_args.return_value = mock_args
+
+        from datetime import date
+
+        from dkbparsing.models import (
+            ParsingResult,
+            Transaction,
+            TransactionType,
+        )
+
+        mock_result = ParsingResult(
+            parsed_transactions=[],
+            uncategorized_transactions=[
+                Transaction(
+                    booking_date=date(2025, 8, 1),
+                    value_date=date(2025, 8, 1),
+                    status="Gebucht",
+                    payer="Test",
+                    recipient="Unknown",
+                    purpose="Test",
+                    transaction_type=TransactionType.EXPENSE,
+                    iban="DE123456789",
+                    amount=-10.0,
                 ),
-                patch("dkbparsing.cli.argparse.ArgumentParser") as mock_parser_class,
-            ):
-                mock_parser = Mock()
-                mock_parser_class.return_value = mock_parser
-                mock_args = Mock()
-                mock_args.config = str(config_file)
-                mock_args.csv_file = str(csv_file)
-                mock_args.add_category = None
-                mock_args.add_manual = None
-                mock_args.add_search_string = None
-                mock_args.remove_search_string = None
-                mock_args.verbose = False
-                mock_args.start_date = None
-                mock_args.end_date = None
-                mock_args.version = False
-                mock_parser.parse_args.return_value = mock_args
-
-                with (
-                    patch(
-                        "dkbparsing.cli.load_config",
-                        return_value=config_data,
-                    ),
-                    patch("dkbparsing.cli.DKBParser") as mock_parser_class,
-                    patch("dkbparsing.cli.call_openrouter") as mock_openrouter,
-                    patch("dkbparsing.cli.logger"),
-                ):
-                    mock_dkb_parser = Mock()
-                    mock_parser_class.return_value = mock_dkb_parser
-
-                    from datetime import datetime
-
-                    from dkbparsing.models import (
-                        ParsingResult,
-                        Transaction,
-                        TransactionType,
-                    )
-
-                    mock_result = ParsingResult(
-                        parsed_transactions=[],
-                        uncategorized_transactions=[
-                            Transaction(
-                                booking_date=datetime(2025, 8, 1),
-                                value_date=datetime(2025, 8, 1),
-                                status="Gebucht",
-                                payer="Test",
-                                recipient="Unknown",
-                                purpose="Test",
-                                transaction_type=TransactionType.EXPENSE,
-                                iban="DE123456789",
-                                amount=-10.0,
-                            ),
-                        ],
-                        category_totals={},
-                        total_income=0.0,
-                        total_expenses=-10.0,
-                    )
-
-                    mock_dkb_parser.parse_file.return_value = mock_result
-                    mock_dkb_parser.format_for_excel.return_value = "Excel output"
-                    mock_dkb_parser.category_manager.manual_assignments = []
-                    mock_openrouter.return_value = "AI suggestions"
-
-                    main()
-
-                    # Verify OpenRouter was called with user_prompt_file
-                    mock_openrouter.assert_called_once()
-                    call_args = mock_openrouter.call_args
-                    assert call_args[1]["user_prompt_file"] == user_prompt_file
+            ],
+            category_totals={},
+            total_income=0.0,
+            total_expenses=-10.0,
+        )
+
+        mock_dkb_parser.parse_file.return_value = mock_result
+        mock_dkb_parser.format_for_excel.return_value = "Excel output"
+        mock_dkb_parser.category_manager = Mock(manual_assignments=[])
+        mock_openrouter.return_value = "AI suggestions"
+
+        with patched_config(config_data):
+            main()
+
+        # Verify OpenRouter was called with user_prompt_file
+        mock_openrouter.assert_called_once()
+        call_args = mock_openrouter.call_args
+        assert call_args[1]["user_prompt_file"] == user_prompt_file
@@ -1,13 +1,28 @@
 """Unit tests for csv_parser.py."""
 
-import tempfile
-from datetime import datetime
-from pathlib import Path
+import io
+from datetime import date, datetime
+from typing import Final
 
 import pytest
 
 from dkbparsing.csv_parser import DKBCSVParser
-from dkbparsing.models import Transaction, TransactionType
+from dkbparsing.models import TransactionType
+
+# Header lines of a DKB export that precede the column names
+_HEADER: Final[str] = "Header line 1\nHeader line 2\nHeader line 3\nHeader line 4\n"
+_COLUMNS: Final[str] = (
+    "Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;"
+    "Verwendungszweck;Betrag (€);IBAN\n"
+)
+_ROW_EXPENSE: Final[str] = (
+    "15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;"
+    "-50,25 €;DE89370400440532013000\n"
+)
+_ROW_SALARY: Final[str] = (
+    "20.02.24;21.02.24;Buchung;Employer;Max Mustermann;Salary;2000,00 €;"
+    "DE89370400440532013000\n"
+)
 
 
 class TestDKBCSVParser:
@@ -27,279 +42,111 @@ class TestDKBCSVParser:
         assert parser.delimiter == ","
         assert parser.skiprows == 5
 
-    def test_parse_file_valid_csv(self):
-        """Test parsing a valid DKB CSV file."""
-        # Create a temporary CSV file with DKB format
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN
-15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;-50,25 €;DE89370400440532013000
-20.02.24;21.02.24;Buchung;Employer;Max Mustermann;Salary;2000,00 €;DE89370400440532013000
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser()
-            transactions = parser.parse_file(csv_path)
-
-            assert len(transactions) == 2
-            assert transactions[0].amount == -50.25
-            assert transactions[0].transaction_type == TransactionType.EXPENSE
-            assert transactions[0].recipient == "Supermarket"
-            assert transactions[0].purpose == "Grocery shopping"
-            assert transactions[1].amount == 2000.00
-            assert transactions[1].transaction_type == TransactionType.INCOME
-            assert transactions[1].payer == "Employer"
-        finally:
-            Path(csv_path).unlink()
-
-    def test_parse_file_with_optional_fields(self):
-        """Test parsing CSV file with optional fields."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN;Gläubiger-ID;Mandatsreferenz;Kundenreferenz
-15.01.24;16.01.24;Buchung;Max Mustermann;Company;Payment;50,25 €;DE89370400440532013000;DE98ZZZ09999999999;MANDATE123;CUST456
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser()
-            transactions = parser.parse_file(csv_path)
-
-            assert len(transactions) == 1
-            assert transactions[0].creditor_id == "DE98ZZZ09999999999"
-            assert transactions[0].mandate_reference == "MANDATE123"
-            assert transactions[0].customer_reference == "CUST456"
-        finally:
-            Path(csv_path).unlink()
-
-    def test_parse_file_with_invalid_row(self):
-        """Test parsing CSV file with invalid rows (should skip them)."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN
-15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;50,25 €;DE89370400440532013000
-invalid;date;row;should;be;skipped;xxx;yyy
-20.02.24;21.02.24;Buchung;Employer;Max Mustermann;Salary;2000,00 €;DE89370400440532013000
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser()
-            transactions = parser.parse_file(csv_path)
-
-            # Should only have 2 valid transactions
-            assert len(transactions) == 2
-            assert transactions[0].recipient == "Supermarket"
-            assert transactions[1].payer == "Employer"
-        finally:
-            Path(csv_path).unlink()
-
-    def test_parse_file_missing_file(self):
+    @pytest.mark.parametrize(
+        ("csv_content", "parser_kwargs", "expected"),
+        [
+            pytest.param(
+                _HEADER + _COLUMNS + _ROW_EXPENSE + _ROW_SALARY,
+                {},
+                [
+                    {
+                        "amount": -50.25,
+                        "transaction_type": TransactionType.EXPENSE,
+                        "recipient": "Supermarket",
+                        "purpose": "Grocery shopping",
+                    },
+                    {
+                        "amount": 2000.00,
+                        "transaction_type": TransactionType.INCOME,
+                        "payer": "Employer",
+                    },
+                ],
+                id="valid_csv",
+            ),
+            pytest.param(
+                _HEADER
+                + _COLUMNS.replace(
+                    "IBAN\n",
+                    "IBAN;Gläubiger-ID;Mandatsreferenz;Kundenreferenz\n",
+                )
+                + "15.01.24;16.01.24;Buchung;Max Mustermann;Company;Payment;50,25 €;"
+                "DE89370400440532013000;DE98ZZZ09999999999;MANDATE123;CUST456\n",
+                {},
+                [
+                    {
+                        "creditor_id": "DE98ZZZ09999999999",
+                        "mandate_reference": "MANDATE123",
+                        "customer_reference": "CUST456",
+                    },
+                ],
+                id="optional_fields",
+            ),
+            pytest.param(
+                _HEADER
+                + _COLUMNS
+                + _ROW_EXPENSE
+                + "invalid;date;row;should;be;skipped;xxx;yyy\n"
+                + _ROW_SALARY,
+                {},
+                [{"recipient": "Supermarket"}, {"payer": "Employer"}],
+                id="invalid_row_skipped",
+            ),
+            pytest.param(_HEADER + _COLUMNS, {}, [], id="empty_file"),
+            pytest.param(
+                (_HEADER + _COLUMNS + _ROW_EXPENSE).replace(";", "\t"),
+                {"delimiter": "\t"},
+                [{"recipient": "Supermarket", "amount": -50.25}],
+                id="custom_delimiter",
+            ),
+            pytest.param(
+                _HEADER + "Header line 5\n" + _COLUMNS + _ROW_EXPENSE,
+                {"skiprows": 5},
+                [{"recipient": "Supermarket"}],
+                id="custom_skiprows",
+            ),
+            pytest.param(
+                _HEADER + _COLUMNS.replace(";", " ; ") + _ROW_EXPENSE,
+                {},
+                [{"recipient": "Supermarket"}],
+                id="columns_with_whitespace",
+            ),
+        ],
+    )
+    def test_parse_stream(self, csv_parser, csv_content, parser_kwargs, expected):
+        """Test parsing DKB CSV content into transactions."""
+        parser = DKBCSVParser(**parser_kwargs) if parser_kwargs else csv_parser
+        transactions = parser.parse_stream(io.StringIO(csv_content))
+
+        assert len(transactions) == len(expected)
+        for transaction, attributes in zip(transactions, expected, strict=True):
+            for name, value in attributes.items():
+                assert getattr(transaction, name) == value
+
+    def test_parse_file_missing_file(self, csv_parser):
         """Test parsing a non-existent file."""
-        parser = DKBCSVParser()
         with pytest.raises(ValueError, match="Error parsing CSV file"):
-            parser.parse_file("/nonexistent/path/file.csv")
-
-    def test_parse_file_empty_file(self):
-        """Test parsing an empty CSV file (only headers)."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser()
-            transactions = parser.parse_file(csv_path)
-
-            assert len(transactions) == 0
-        finally:
-            Path(csv_path).unlink()
+            csv_parser.parse_file("/nonexistent/path/file.csv")
 
-    def test_parse_file_custom_encoding(self):
+    def test_parse_file_custom_encoding(self, tmp_csv_dir):
         """Test parsing CSV file with custom encoding."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN
-15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;50,25 €;DE89370400440532013000
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser(encoding="utf-8")
-            transactions = parser.parse_file(csv_path)
-
-            assert len(transactions) == 1
-        finally:
-            Path(csv_path).unlink()
-
-    def test_parse_file_custom_delimiter(self):
-        """Test parsing CSV file with custom delimiter (tab-separated)."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum	Wertstellung	Status	Zahlungspflichtige*r	Zahlungsempfänger*in	Verwendungszweck	Betrag (€)	IBAN
-15.01.24	16.01.24	Buchung	Max Mustermann	Supermarket	Grocery shopping	-50,25 €	DE89370400440532013000
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser(delimiter="\t")
-            transactions = parser.parse_file(csv_path)
-
-            assert len(transactions) == 1
-            assert transactions[0].recipient == "Supermarket"
-            assert transactions[0].amount == -50.25
-        finally:
-            Path(csv_path).unlink()
+        csv_content = _HEADER + _COLUMNS + _ROW_EXPENSE
+        csv_file = tmp_csv_dir / "cp1252.csv"
+        csv_file.write_bytes(csv_content.encode("cp1252"))
 
-    def test_parse_file_custom_skiprows(self):
-        """Test parsing CSV file with custom skiprows."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Header line 5
-Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN
-15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;50,25 €;DE89370400440532013000
-"""
+        parser = DKBCSVParser(encoding="cp1252")
+        transactions = parser.parse_file(str(csv_file))
 
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
+        assert len(transactions) == 1
+        assert transactions[0].amount == -50.25
 
-        try:
-            parser = DKBCSVParser(skiprows=5)
-            transactions = parser.parse_file(csv_path)
-
-            assert len(transactions) == 1
-        finally:
-            Path(csv_path).unlink()
-
-    def test_parse_file_columns_with_whitespace(self):
-        """Test parsing CSV file with column names containing whitespace."""
-        csv_content = """Header line 1
-Header line 2
-Header line 3
-Header line 4
-Buchungsdatum ; Wertstellung ; Status ; Zahlungspflichtige*r ; Zahlungsempfänger*in ; Verwendungszweck ; Betrag (€) ; IBAN
-15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;50,25 €;DE89370400440532013000
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            delete=False,
-            suffix=".csv",
-            encoding="utf-8",
-        ) as f:
-            f.write(csv_content)
-            csv_path = f.name
-
-        try:
-            parser = DKBCSVParser()
-            transactions = parser.parse_file(csv_path)
-
-            # Should still parse correctly after stripping whitespace
-            assert len(transactions) == 1
-            assert transactions[0].recipient == "Supermarket"
-        finally:
-            Path(csv_path).unlink()
-
-    def test_filter_by_date_range_all_in_range(self):
+    def test_filter_by_date_range_all_in_range(self, csv_parser, make_tx):
         """Test filtering transactions where all are in date range."""
-        booking_date = datetime(2024, 1, 15)
         transactions = [
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 1, 16),
-                status="Buchung",
-                payer="Max Mustermann",
-                recipient="Supermarket",
-                purpose="Grocery shopping",
-                transaction_type=TransactionType.EXPENSE,
-                iban="DE89370400440532013000",
-                amount=-50.25,
-            ),
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 1, 20),
-                status="Buchung",
-                payer="Employer",
-                recipient="Max Mustermann",
-                purpose="Salary",
-                transaction_type=TransactionType.INCOME,
-                iban="DE89370400440532013000",
-                amount=2000.00,
-            ),
+            make_tx(datetime(2024, 1, 16)),
+            make_tx(datetime(2024, 1, 20), amount=2000.00),
         ]
 
-        parser = DKBCSVParser()
-        filtered = parser.filter_by_date_range(
+        filtered = csv_parser.filter_by_date_range(
             transactions,
             start_date=datetime(2024, 1, 1),
             end_date=datetime(2024, 1, 31),
@@ -308,36 +155,14 @@ Buchungsdatum ; Wertstellung ; Status ; Zahlungspflichtige*r ; Zahlungsempfänge
         assert len(filtered) == 2
         assert filtered == transactions
 
-    def test_filter_by_date_range_some_in_range(self):
+    def test_filter_by_date_range_some_in_range(self, csv_parser, make_tx):
         """Test filtering transactions where some are in date range."""
-        booking_date = datetime(2024, 1, 15)
         transactions = [
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 1, 16),
-                status="Buchung",
-                payer="Max Mustermann",
-                recipient="Supermarket",
-                purpose="Grocery shopping",
-                transaction_type=TransactionType.EXPENSE,
-                iban="DE89370400440532013000",
-                amount=-50.25,
-            ),
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 2, 20),
-                status="Buchung",
-                payer="Employer",
-                recipient="Max Mustermann",
-                purpose="Salary",
-                transaction_type=TransactionType.INCOME,
-                iban="DE89370400440532013000",
-                amount=2000.00,
-            ),
+            make_tx(datetime(2024, 1, 16)),
+            make_tx(datetime(2024, 2, 20), amount=2000.00),
         ]
 
-        parser = DKBCSVParser()
-        filtered = parser.filter_by_date_range(
+        filtered = csv_parser.filter_by_date_range(
             transactions,
             start_date=datetime(2024, 1, 1),
             end_date=datetime(2024, 1, 31),
@@ -346,36 +171,14 @@ Buchungsdatum ; Wertstellung ; Status ; Zahlungspflichtige*r ; Zahlungsempfänge
         assert len(filtered) == 1
         assert filtered[0].value_date == datetime(2024, 1, 16)
 
-    def test_filter_by_date_range_none_in_range(self):
+    def test_filter_by_date_range_none_in_range(self, csv_parser, make_tx):
         """Test filtering transactions where none are in date range."""
-        booking_date = datetime(2024, 1, 15)
         transactions = [
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 2, 16),
-                status="Buchung",
-                payer="Max Mustermann",
-                recipient="Supermarket",
-                purpose="Grocery shopping",
-                transaction_type=TransactionType.EXPENSE,
-                iban="DE89370400440532013000",
-                amount=-50.25,
-            ),
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 3, 20),
-                status="Buchung",
-                payer="Employer",
-                recipient="Max Mustermann",
-                purpose="Salary",
-                transaction_type=TransactionType.INCOME,
-                iban="DE89370400440532013000",
-                amount=2000.00,
-            ),
+            make_tx(datetime(2024, 2, 16)),
+            make_tx(datetime(2024, 3, 20), amount=2000.00),
         ]
 
-        parser = DKBCSVParser()
-        filtered = parser.filter_by_date_range(
+        filtered = csv_parser.filter_by_date_range(
             transactions,
             start_date=datetime(2024, 1, 1),
             end_date=datetime(2024, 1, 31),
@@ -383,10 +186,24 @@ Buchungsdatum ; Wertstellung ; Status ; Zahlungspflichtige*r ; Zahlungsempfänge
 
         assert len(filtered) == 0
 
-    def test_filter_by_date_range_empty_list(self):
+    def test_filter_by_date_range_mixed_date_types(self, csv_parser, make_tx):
+        """Test that date values can be filtered with datetime bounds."""
+        transactions = [
+            make_tx(value_date, amount=-25.00, booking_date=date(2024, 1, 31))
+            for value_date in (date(2024, 1, 31), date(2024, 2, 1))
+        ]
+
+        filtered = csv_parser.filter_by_date_range(
+            transactions,
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 1, 31),
+        )
+
+        assert filtered == transactions[:1]
+
+    def test_filter_by_date_range_empty_list(self, csv_parser):
         """Test filtering empty transaction list."""
-        parser = DKBCSVParser()
-        filtered = parser.filter_by_date_range(
+        filtered = csv_parser.filter_by_date_range(
             [],
             start_date=datetime(2024, 1, 1),
             end_date=datetime(2024, 1, 31),
@@ -394,58 +211,16 @@ Buchungsdatum ; Wertstellung ; Status ; Zahlungspflichtige*r ; Zahlungsempfänge
 
         assert len(filtered) == 0
 
-    def test_filter_by_date_range_boundary_dates(self):
+    def test_filter_by_date_range_boundary_dates(self, csv_parser, make_tx):
         """Test filtering with boundary dates (inclusive)."""
-        booking_date = datetime(2024, 1, 15)
         transactions = [
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 1, 1),  # Start date
-                status="Buchung",
-                payer="Max Mustermann",
-                recipient="Supermarket",
-                purpose="Grocery shopping",
-                transaction_type=TransactionType.EXPENSE,
-                iban="DE89370400440532013000",
-                amount=-50.25,
-            ),
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 1, 31),  # End date
-                status="Buchung",
-                payer="Employer",
-                recipient="Max Mustermann",
-                purpose="Salary",
-                transaction_type=TransactionType.INCOME,
-                iban="DE89370400440532013000",
-                amount=2000.00,
-            ),
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2023, 12, 31),  # Before start
-                status="Buchung",
-                payer="Max Mustermann",
-                recipient="Store",
-                purpose="Purchase",
-                transaction_type=TransactionType.EXPENSE,
-                iban="DE89370400440532013000",
-                amount=-25.00,
-            ),
-            Transaction(
-                booking_date=booking_date,
-                value_date=datetime(2024, 2, 1),  # After end
-                status="Buchung",
-                payer="Max Mustermann",
-                recipient="Store",
-                purpose="Purchase",
-                transaction_type=TransactionType.EXPENSE,
-                iban="DE89370400440532013000",
-                amount=-30.00,
-            ),
+            make_tx(datetime(2024, 1, 1)),  # Start date
+            make_tx(datetime(2024, 1, 31), amount=2000.00),  # End date
+            make_tx(datetime(2023, 12, 31), amount=-25.00),  # Before start
+            make_tx(datetime(2024, 2, 1), amount=-30.00),  # After end
         ]
 
-        parser = DKBCSVParser()
-        filtered = parser.filter_by_date_range(
+        filtered = csv_parser.filter_by_date_range(
             transactions,
             start_date=datetime(2024, 1, 1),
             end_date=datetime(2024, 1, 31),
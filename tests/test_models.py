@@ -1,6 +1,9 @@
 """Unit tests for models.py."""
 
-from datetime import datetime
+from datetime import date
+from typing import Final
+
+import pytest
 
 from dkbparsing.models import (
     Category,
@@ -10,6 +13,17 @@ from dkbparsing.models import (
     TransactionType,
 )
 
+# CSV row of a DKB export without the amount column
+_BASE_ROW: Final[dict[str, str]] = {
+    "Buchungsdatum": "15.01.24",
+    "Wertstellung": "16.01.24",
+    "Status": "Buchung",
+    "Zahlungspflichtige*r": "Max Mustermann",
+    "Zahlungsempfänger*in": "Jane Doe",
+    "Verwendungszweck": "Test",
+    "IBAN": "DE89370400440532013000",
+}
+
 
 class TestTransactionType:
     """Tests for TransactionType enum."""
@@ -34,8 +48,8 @@ class TestTransaction:
 
     def test_transaction_creation(self):
         """Test creating a Transaction with all required fields."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
         transaction = Transaction(
             booking_date=booking_date,
             value_date=value_date,
@@ -63,8 +77,8 @@ class TestTransaction:
 
     def test_transaction_with_optional_fields(self):
         """Test creating a Transaction with optional fields."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
         transaction = Transaction(
             booking_date=booking_date,
             value_date=value_date,
@@ -99,8 +113,9 @@ class TestTransaction:
 
         transaction = Transaction.from_csv_row(row)
 
-        assert transaction.booking_date == datetime(2024, 1, 15)
-        assert transaction.value_date == datetime(2024, 1, 16)
+        assert transaction.booking_date == date(2024, 1, 15)
+        assert transaction.value_date == date(2024, 1, 16)
+        assert type(transaction.value_date) is date
         assert transaction.status == "Buchung"
         assert transaction.payer == "Max Mustermann"
         assert transaction.recipient == "Jane Doe"
@@ -124,8 +139,8 @@ class TestTransaction:
 
         transaction = Transaction.from_csv_row(row)
 
-        assert transaction.booking_date == datetime(2024, 2, 20)
-        assert transaction.value_date == datetime(2024, 2, 21)
+        assert transaction.booking_date == date(2024, 2, 20)
+        assert transaction.value_date == date(2024, 2, 21)
         assert transaction.amount == -50.25
         assert transaction.transaction_type == TransactionType.EXPENSE
 
@@ -151,30 +166,21 @@ class TestTransaction:
         assert transaction.mandate_reference == "MANDATE123"
         assert transaction.customer_reference == "CUST456"
 
-    def test_from_csv_row_amount_parsing(self):
+    @pytest.mark.parametrize(
+        ("amount_str", "expected_amount"),
+        [
+            pytest.param("100,50 €", 100.50, id="decimal_comma"),
+            pytest.param("1.000,50 €", 1000.50, id="thousand_sep"),
+            pytest.param("-50,25 €", -50.25, id="negative"),
+            pytest.param("-1.234,56 €", -1234.56, id="negative_thousand_sep"),
+            pytest.param("0,00 €", 0.0, id="zero"),
+        ],
+    )
+    def test_from_csv_row_amount_parsing(self, amount_str, expected_amount):
         """Test parsing different German number formats."""
-        test_cases = [
-            ("100,50 €", 100.50),
-            ("1.000,50 €", 1000.50),
-            ("-50,25 €", -50.25),
-            ("-1.234,56 €", -1234.56),
-            ("0,00 €", 0.0),
-        ]
-
-        base_row = {
-            "Buchungsdatum": "15.01.24",
-            "Wertstellung": "16.01.24",
-            "Status": "Buchung",
-            "Zahlungspflichtige*r": "Max Mustermann",
-            "Zahlungsempfänger*in": "Jane Doe",
-            "Verwendungszweck": "Test",
-            "IBAN": "DE89370400440532013000",
-        }
-
-        for amount_str, expected_amount in test_cases:
-            row = {**base_row, "Betrag (€)": amount_str}
-            transaction = Transaction.from_csv_row(row)
-            assert transaction.amount == expected_amount
+        row = _BASE_ROW | {"Betrag (€)": amount_str}
+        transaction = Transaction.from_csv_row(row)
+        assert transaction.amount == expected_amount
 
     def test_from_csv_row_zero_amount(self):
         """Test that zero amount is treated as income."""
@@ -254,14 +260,24 @@ class TestCategory:
 
         assert category.iban_patterns == []
 
+    def test_category_uses_slots(self):
+        """Test that categories have no instance dict."""
+        category = Category(
+            name="test",
+            display_name="Test",
+            search_strings=["test"],
+        )
+
+        assert not hasattr(category, "__dict__")
+
 
 class TestParsedTransaction:
     """Tests for ParsedTransaction dataclass."""
 
     def test_parsed_transaction_creation(self):
         """Test creating a ParsedTransaction with transaction and category."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
         transaction = Transaction(
             booking_date=booking_date,
             value_date=value_date,
@@ -288,8 +304,8 @@ class TestParsedTransaction:
 
     def test_parsed_transaction_without_category(self):
         """Test creating a ParsedTransaction without category."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
         transaction = Transaction(
             booking_date=booking_date,
             value_date=value_date,
@@ -310,8 +326,8 @@ class TestParsedTransaction:
 
     def test_parsed_transaction_with_search_matches(self):
         """Test creating a ParsedTransaction with search matches."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
         transaction = Transaction(
             booking_date=booking_date,
             value_date=value_date,
@@ -340,8 +356,8 @@ class TestParsedTransaction:
 
     def test_parsed_transaction_search_matches_default(self):
         """Test that search_matches defaults to empty list if None."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
         transaction = Transaction(
             booking_date=booking_date,
             value_date=value_date,
@@ -362,14 +378,32 @@ class TestParsedTransaction:
 
         assert parsed.search_matches == []
 
+    def test_parsed_transaction_uses_slots(self):
+        """Test that transactions and parsed transactions have no instance dict."""
+        transaction = Transaction(
+            booking_date=date(2024, 1, 15),
+            value_date=date(2024, 1, 16),
+            status="Buchung",
+            payer="Max Mustermann",
+            recipient="Test",
+            purpose="Test",
+            transaction_type=TransactionType.EXPENSE,
+            iban="DE89370400440532013000",
+            amount=-10.00,
+        )
+        parsed = ParsedTransaction(transaction=transaction, category=None)
+
+        assert not hasattr(transaction, "__dict__")
+        assert not hasattr(parsed, "__dict__")
+
 
 class TestParsingResult:
     """Tests for ParsingResult dataclass."""
 
     def test_parsing_result_creation(self):
         """Test creating a ParsingResult with all fields."""
-        booking_date = datetime(2024, 1, 15)
-        value_date = datetime(2024, 1, 16)
+        booking_date = date(2024, 1, 15)
+        value_date = date(2024, 1, 16)
 
         transaction1 = Transaction(
             booking_date=booking_date,
@@ -313,6 +313,24 @@ class TestExcelFormatter:
         assert "Rent" in sorted_categories[1:4]
         assert "Utilities" in sorted_categories[1:4]
 
+    def test_format_for_excel_category_order_argument(self):
+        """Test that a per-call category_order overrides the instance order."""
+        result = ParsingResult(
+            parsed_transactions=[],
+            uncategorized_transactions=[],
+            category_totals={"Groceries": -50.25, "Salary": 2000.00},
+            total_income=2000.00,
+            total_expenses=-50.25,
+        )
+
+        formatter = ExcelFormatter(category_order=["Groceries", "Salary"])
+        output = formatter.format_for_excel(result, category_order=["Salary"])
+
+        lines = output.split("\n")
+        assert lines[1] == "Salary: 2000,0"
+        assert lines[2] == "Groceries: -50,25"
+        assert formatter.category_order == ["Groceries", "Salary"]
+
     def test_format_amount(self):
         """Test formatting amounts for German Excel."""
         formatter = ExcelFormatter()
@@ -379,6 +397,36 @@ class TestHouseholdFormatter:
         finally:
             Path(template_path).unlink()
 
+    def test_format_household_output_reuses_loaded_template(self):
+        """Test that the template is read once and reused for every render."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, encoding="utf-8") as f:
+            f.write("Groceries\n")
+            f.write("\n")
+            f.write("Salary\n")
+            template_path = f.name
+
+        try:
+            formatter = HouseholdFormatter(template_path)
+            Path(template_path).write_text("Rent\n", encoding="utf-8")
+
+            for groceries, salary in [(-50.25, 2000.00), (-10.00, 1500.00)]:
+                result = ParsingResult(
+                    parsed_transactions=[],
+                    uncategorized_transactions=[],
+                    category_totals={"Groceries": groceries, "Salary": salary},
+                    total_income=salary,
+                    total_expenses=groceries,
+                )
+
+                lines = formatter.format_household_output(result).split("\n")
+                assert lines[1:] == [
+                    str(groceries).replace(".", ","),
+                    "",
+                    str(salary).replace(".", ","),
+                ]
+        finally:
+            Path(template_path).unlink()
+
     def test_format_household_output_case_insensitive(self):
         """Test household formatting with case-insensitive matching."""
         with tempfile.NamedTemporaryFile(mode="w", delete=False, encoding="utf-8") as f:
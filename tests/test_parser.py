@@ -1,10 +1,11 @@
 """Unit tests for parser.py."""
 
 import tempfile
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from dkbparsing.csv_parser import DKBCSVParser
 from dkbparsing.models import (
     Category,
     ParsedTransaction,
@@ -12,6 +13,7 @@ from dkbparsing.models import (
     Transaction,
     TransactionType,
 )
+from dkbparsing.output_formatter import HouseholdFormatter
 from dkbparsing.parser import DKBParser
 
 
@@ -31,6 +33,19 @@ class TestDKBParserInitialization:
             assert parser.excel_formatter is not None
             assert parser.summary_formatter is not None
 
+    def test_init_creates_formatters_lazily(self):
+        """Test that formatters are only created on first access and then reused."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            category_file = Path(tmpdir) / "categories.json"
+            manual_file = Path(tmpdir) / "manual.json"
+
+            parser = DKBParser(category_file, manual_file)
+
+            assert "excel_formatter" not in vars(parser)
+            assert "summary_formatter" not in vars(parser)
+            assert parser.excel_formatter is parser.excel_formatter
+            assert parser.summary_formatter is parser.summary_formatter
+
     def test_init_passes_files_to_category_manager(self):
         """Test that files are passed to CategoryManager."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -56,8 +71,8 @@ class TestDKBParserParseFile:
 
             # Mock CSV parser
             mock_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -104,8 +119,8 @@ class TestDKBParserParseFile:
             parser = DKBParser(category_file, manual_file)
 
             mock_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -116,8 +131,8 @@ class TestDKBParserParseFile:
             )
 
             filtered_transaction = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Test",
@@ -170,8 +185,8 @@ class TestDKBParserParseFile:
             parser = DKBParser(category_file, manual_file)
 
             transaction1 = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -182,8 +197,8 @@ class TestDKBParserParseFile:
             )
 
             transaction2 = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -223,8 +238,8 @@ class TestDKBParserParseFile:
             parser = DKBParser(category_file, manual_file)
 
             income_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Employer",
                 recipient="Test",
@@ -235,8 +250,8 @@ class TestDKBParserParseFile:
             )
 
             expense_transaction = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -283,8 +298,8 @@ class TestDKBParserParseFile:
             parser = DKBParser(category_file, manual_file)
 
             categorized_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -295,8 +310,8 @@ class TestDKBParserParseFile:
             )
 
             uncategorized_transaction = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Unknown",
@@ -364,8 +379,8 @@ class TestDKBParserParseFile:
             parser = DKBParser(category_file, manual_file)
 
             mock_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Test",
@@ -394,8 +409,8 @@ class TestDKBParserParseFile:
             parser = DKBParser(category_file, manual_file)
 
             mock_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Test",
@@ -416,6 +431,104 @@ class TestDKBParserParseFile:
             parser.csv_parser.filter_by_date_range.assert_not_called()
 
 
+class TestDKBParserParseFiles:
+    """Tests for parse_files method."""
+
+    def test_parse_files_single_file_runs_in_process(self):
+        """Test that a single file is parsed without a process pool."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            category_file = Path(tmpdir) / "categories.json"
+            manual_file = Path(tmpdir) / "manual.json"
+
+            parser = DKBParser(category_file, manual_file)
+            mock_result = Mock()
+            parser.parse_file = Mock(return_value=mock_result)
+
+            with patch("dkbparsing.parser.ProcessPoolExecutor") as mock_executor:
+                results = parser.parse_files(
+                    ["test.csv"],
+                    start_date=datetime(2024, 1, 1),
+                    end_date=datetime(2024, 1, 31),
+                )
+
+            mock_executor.assert_not_called()
+            parser.parse_file.assert_called_once_with(
+                "test.csv",
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 31),
+            )
+            assert results == [mock_result]
+
+    def test_parse_files_multiple_files_in_order(self):
+        """Test that several files are parsed in worker processes in input order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            category_file = Path(tmpdir) / "categories.json"
+            manual_file = Path(tmpdir) / "manual.json"
+
+            parser = DKBParser(category_file, manual_file)
+            parser.add_category("groceries", "Groceries", ["supermarket"])
+
+            header = (
+                "Header line 1\nHeader line 2\nHeader line 3\nHeader line 4\n"
+                "Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;"
+                "Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN\n"
+            )
+            csv_files = []
+            for index, amount in enumerate(["-10,00 €", "-20,00 €"]):
+                csv_file = Path(tmpdir) / f"statement_{index}.csv"
+                csv_file.write_text(
+                    header
+                    + f"15.01.24;16.01.24;Buchung;Test;Supermarket;Food;{amount};DE89370400440532013000\n",
+                    encoding="utf-8",
+                )
+                csv_files.append(str(csv_file))
+
+            results = parser.parse_files(csv_files, max_workers=2)
+
+            assert [result.category_totals for result in results] == [
+                {"Groceries": -10.0},
+                {"Groceries": -20.0},
+            ]
+
+    def test_parse_files_workers_use_parser_state(self):
+        """Test that workers use the parser's CSV options and unsaved categories."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            category_file = Path(tmpdir) / "categories.json"
+            manual_file = Path(tmpdir) / "manual.json"
+
+            parser = DKBParser(category_file, manual_file)
+            parser.csv_parser = DKBCSVParser(delimiter="\t")
+            parser.add_category("groceries", "Groceries", ["supermarket"])
+            # Search strings are not auto-saved
+            parser.add_search_string("groceries", "bakery")
+
+            header = (
+                "Header line 1\nHeader line 2\nHeader line 3\nHeader line 4\n"
+                "Buchungsdatum\tWertstellung\tStatus\tZahlungspflichtige*r\t"
+                "Zahlungsempfänger*in\tVerwendungszweck\tBetrag (€)\tIBAN\n"
+            )
+            csv_files = []
+            for index, amount in enumerate(["-10,00 €", "-20,00 €"]):
+                csv_file = Path(tmpdir) / f"statement_{index}.csv"
+                csv_file.write_text(
+                    header
+                    + f"15.01.24\t16.01.24\tBuchung\tTest\tBakery\tBread\t{amount}\t"
+                    "DE89370400440532013000\n",
+                    encoding="utf-8",
+                )
+                csv_files.append(str(csv_file))
+
+            results = parser.parse_files(csv_files, max_workers=2)
+
+            assert [result.category_totals for result in results] == [
+                parser.parse_file(csv_file).category_totals for csv_file in csv_files
+            ]
+            assert [result.category_totals for result in results] == [
+                {"Groceries": -10.0},
+                {"Groceries": -20.0},
+            ]
+
+
 class TestDKBParserCategoryManagement:
     """Tests for category management delegation methods."""
 
@@ -600,7 +713,7 @@ class TestDKBParserFormatting:
             assert result == "formatted"
 
     def test_format_for_excel_with_category_order(self):
-        """Test that format_for_excel sets category_order if provided."""
+        """Test that format_for_excel passes category_order per call."""
         with tempfile.TemporaryDirectory() as tmpdir:
             category_file = Path(tmpdir) / "categories.json"
             manual_file = Path(tmpdir) / "manual.json"
@@ -620,8 +733,12 @@ class TestDKBParserFormatting:
 
             parser.format_for_excel(mock_result, category_order)
 
-            assert parser.excel_formatter.category_order == category_order
-            parser.excel_formatter.format_for_excel.assert_called_once_with(mock_result)
+            # The shared formatter must not be mutated
+            assert parser.excel_formatter.category_order == []
+            parser.excel_formatter.format_for_excel.assert_called_once_with(
+                mock_result,
+                category_order=category_order,
+            )
 
     def test_format_summary(self):
         """Test that format_summary delegates to SummaryFormatter with warnings."""
@@ -682,6 +799,37 @@ class TestDKBParserFormatting:
                 )
                 assert result == "household"
 
+    def test_format_household_reuses_formatter(self):
+        """Test that the formatter is reused until the template file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            category_file = Path(tmpdir) / "categories.json"
+            manual_file = Path(tmpdir) / "manual.json"
+            template_file = Path(tmpdir) / "template.txt"
+            template_file.write_text("Groceries\n", encoding="utf-8")
+
+            parser = DKBParser(category_file, manual_file)
+            result = ParsingResult(
+                parsed_transactions=[],
+                uncategorized_transactions=[],
+                category_totals={"Groceries": -10.0},
+                total_income=0.0,
+                total_expenses=-10.0,
+            )
+
+            with patch(
+                "dkbparsing.parser.HouseholdFormatter",
+                wraps=HouseholdFormatter,
+            ) as mock_hf_class:
+                first = parser.format_household(result, str(template_file))
+                second = parser.format_household(result, str(template_file))
+                assert mock_hf_class.call_count == 1
+                assert first == second
+
+                template_file.write_text("Rent\nGroceries\n", encoding="utf-8")
+                third = parser.format_household(result, str(template_file))
+                assert mock_hf_class.call_count == 2
+                assert third.split("\n")[1:] == ["", "-10,0"]
+
 
 class TestDKBParserExpectedMaxAmount:
     """Tests for expected maximum amount validation."""
@@ -893,8 +1041,8 @@ class TestDKBParserCalculateCategoryTotals:
             parser = DKBParser(category_file, manual_file)
 
             transaction1 = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -905,8 +1053,8 @@ class TestDKBParserCalculateCategoryTotals:
             )
 
             transaction2 = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -938,8 +1086,8 @@ class TestDKBParserCalculateCategoryTotals:
             parser = DKBParser(category_file, manual_file)
 
             transaction1 = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -950,8 +1098,8 @@ class TestDKBParserCalculateCategoryTotals:
             )
 
             transaction2 = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Employer",
                 recipient="Test",
@@ -988,8 +1136,8 @@ class TestDKBParserCalculateCategoryTotals:
             parser = DKBParser(category_file, manual_file)
 
             categorized_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -1000,8 +1148,8 @@ class TestDKBParserCalculateCategoryTotals:
             )
 
             uncategorized_transaction = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Unknown",
@@ -1056,8 +1204,8 @@ class TestDKBParserCalculateIncomeExpenses:
             parser = DKBParser(category_file, manual_file)
 
             transaction1 = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Employer",
                 recipient="Test",
@@ -1068,8 +1216,8 @@ class TestDKBParserCalculateIncomeExpenses:
             )
 
             transaction2 = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Client",
                 recipient="Test",
@@ -1096,8 +1244,8 @@ class TestDKBParserCalculateIncomeExpenses:
             parser = DKBParser(category_file, manual_file)
 
             transaction1 = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -1108,8 +1256,8 @@ class TestDKBParserCalculateIncomeExpenses:
             )
 
             transaction2 = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Store",
@@ -1136,8 +1284,8 @@ class TestDKBParserCalculateIncomeExpenses:
             parser = DKBParser(category_file, manual_file)
 
             income_transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Employer",
                 recipient="Test",
@@ -1148,8 +1296,8 @@ class TestDKBParserCalculateIncomeExpenses:
             )
 
             expense_transaction = Transaction(
-                booking_date=datetime(2024, 1, 20),
-                value_date=datetime(2024, 1, 21),
+                booking_date=date(2024, 1, 20),
+                value_date=date(2024, 1, 21),
                 status="Buchung",
                 payer="Test",
                 recipient="Supermarket",
@@ -1176,8 +1324,8 @@ class TestDKBParserCalculateIncomeExpenses:
             parser = DKBParser(category_file, manual_file)
 
             transaction = Transaction(
-                booking_date=datetime(2024, 1, 15),
-                value_date=datetime(2024, 1, 16),
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
                 status="Buchung",
                 payer="Test",
                 recipient="Test",
@@ -1206,3 +1354,34 @@ class TestDKBParserCalculateIncomeExpenses:
 
             assert income == 0.0
             assert expenses == 0.0
+
+    def test_calculate_income_expenses_is_exactly_rounded(self):
+        """Test that many small amounts are summed without rounding drift."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            category_file = Path(tmpdir) / "categories.json"
+            manual_file = Path(tmpdir) / "manual.json"
+
+            parser = DKBParser(category_file, manual_file)
+
+            transaction = Transaction(
+                booking_date=date(2024, 1, 15),
+                value_date=date(2024, 1, 16),
+                status="Buchung",
+                payer="Test",
+                recipient="Test",
+                purpose="Test",
+                transaction_type=TransactionType.INCOME,
+                iban="DE89370400440532013000",
+                amount=0.1,
+            )
+
+            parsed = [
+                ParsedTransaction(transaction=transaction, category=None)
+                for _ in range(10)
+            ]
+
+            income, expenses = parser._calculate_income_expenses(parsed)
+
+            # A naive running sum yields 0.9999999999999999 here
+            assert income == 1.0
+            assert expenses == 0.0
@@ -0,0 +1,183 @@
+"""Unit tests for transaction_cache.py."""
+
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from dkbparsing.models import Transaction, TransactionType
+from dkbparsing.parser import DKBParser
+from dkbparsing.transaction_cache import TransactionCache
+
+CSV_CONTENT = """Header line 1
+Header line 2
+Header line 3
+Header line 4
+Buchungsdatum;Wertstellung;Status;Zahlungspflichtige*r;Zahlungsempfänger*in;Verwendungszweck;Betrag (€);IBAN
+15.01.24;16.01.24;Buchung;Max Mustermann;Supermarket;Grocery shopping;-50,25 €;DE89370400440532013000
+"""
+
+
+def _make_transaction() -> Transaction:
+    return Transaction(
+        booking_date=date(2024, 1, 15),
+        value_date=date(2024, 1, 16),
+        status="Buchung",
+        payer="Max Mustermann",
+        recipient="Supermarket",
+        purpose="Grocery shopping",
+        transaction_type=TransactionType.EXPENSE,
+        iban="DE89370400440532013000",
+        amount=-50.25,
+        creditor_id="DE98ZZZ09999999999",
+    )
+
+
+class TestTransactionCache:
+    """Tests for TransactionCache class."""
+
+    def test_default_cache_dir_uses_xdg_cache_home(self):
+        """Test that the default cache directory follows XDG_CACHE_HOME."""
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            patch.dict(os.environ, {"XDG_CACHE_HOME": tmpdir}),
+        ):
+            cache = TransactionCache()
+
+            assert cache.cache_dir == Path(tmpdir) / "dkbparsing"
+
+    def test_default_cache_dir_falls_back_to_home(self):
+        """Test that the default cache directory is ~/.cache without XDG_CACHE_HOME."""
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            patch.dict(os.environ, {"HOME": tmpdir, "XDG_CACHE_HOME": "relative"}),
+        ):
+            cache = TransactionCache()
+
+            assert cache.cache_dir == Path(tmpdir) / ".cache" / "dkbparsing"
+
+    def test_load_missing_entry_returns_none(self):
+        """Test that a cache miss returns None."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+
+            assert cache.load(str(csv_file)) is None
+
+    def test_load_nonexistent_csv_returns_none(self):
+        """Test that a missing CSV file is never a cache hit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = TransactionCache(Path(tmpdir) / "cache")
+
+            assert cache.load(str(Path(tmpdir) / "missing.csv")) is None
+
+    def test_store_load_roundtrip(self):
+        """Test that stored transactions are loaded unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+            transaction = _make_transaction()
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+            cache.store(str(csv_file), [transaction])
+
+            assert cache.load(str(csv_file)) == [transaction]
+
+    def test_store_file_is_private(self):
+        """Test that cache files are only readable by the owner."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+            cache.store(str(csv_file), [_make_transaction()])
+
+            (cache_file,) = (Path(tmpdir) / "cache").iterdir()
+            assert cache_file.stat().st_mode & 0o777 == 0o600
+
+    def test_changed_file_invalidates_entry(self):
+        """Test that modifying the CSV file results in a cache miss."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+            cache.store(str(csv_file), [_make_transaction()])
+
+            csv_file.write_text(CSV_CONTENT + "\n", encoding="utf-8")
+
+            assert cache.load(str(csv_file)) is None
+
+    def test_parser_options_are_part_of_key(self):
+        """Test that entries for different parser options are separate."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+            cache.store(str(csv_file), [_make_transaction()], "utf-8:;:4")
+
+            assert cache.load(str(csv_file), "latin-1:;:4") is None
+
+    def test_corrupt_entry_is_ignored(self):
+        """Test that an unreadable cache file is treated as a miss."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+            cache.store(str(csv_file), [_make_transaction()])
+            (cache_file,) = (Path(tmpdir) / "cache").iterdir()
+            cache_file.write_bytes(b"invalid json {")
+
+            assert cache.load(str(csv_file)) is None
+
+    def test_store_failure_does_not_raise(self):
+        """Test that failing to write the cache is not an error."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            cache = TransactionCache(Path(tmpdir) / "cache")
+            with patch("dkbparsing.transaction_cache.os.open", side_effect=OSError):
+                cache.store(str(csv_file), [_make_transaction()])
+
+            assert not os.listdir(Path(tmpdir) / "cache")
+
+
+class TestDKBParserTransactionCache:
+    """Tests for DKBParser using the transaction cache."""
+
+    def test_cache_disabled_by_default(self):
+        """Test that no cache is used without a cache_dir."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            parser = DKBParser(
+                Path(tmpdir) / "categories.json",
+                Path(tmpdir) / "manual.json",
+            )
+
+            assert parser.transaction_cache is None
+
+    def test_parse_file_uses_cache_on_second_run(self):
+        """Test that a warm cache skips CSV parsing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = Path(tmpdir) / "test.csv"
+            csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+
+            parser = DKBParser(
+                Path(tmpdir) / "categories.json",
+                Path(tmpdir) / "manual.json",
+                cache_dir=Path(tmpdir) / "cache",
+            )
+
+            first = parser.parse_file(str(csv_file))
+            with patch.object(parser.csv_parser, "parse_file") as mock_parse:
+                second = parser.parse_file(str(csv_file))
+
+            mock_parse.assert_not_called()
+            assert [pt.transaction for pt in second.parsed_transactions] == [
+                pt.transaction for pt in first.parsed_transactions
+            ]